@@ -5,8 +5,12 @@
 """
 
 from typing import Dict, List, Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import json
+from itertools import islice
+from operator import itemgetter
+import re
 
 from storage.storage import Storage
 from utils.trading_calendar import get_trading_days_to_expiry, get_contract_expiry
@@ -35,6 +39,40 @@ FUTURES_SPOT_MAP = {
     'IH': ('sh000016', '上证50'),
 }
 
+# 基差分析使用的隔季合约: (期货代码, 指数名称, 合约类型, 合约代码, 距到期交易日)
+BASIS_CONTRACTS = (
+    ('IF', '沪深300', '隔季', 'IF2609', 136),
+    ('IC', '中证500', '隔季', 'IC2609', 136),
+    ('IH', '上证50', '隔季', 'IH2609', 136),
+    ('IM', '中证1000', '隔季', 'IM2609', 136),
+)
+
+# 现货指数代码 -> TuShare指数代码
+SPOT_TS_CODES = {
+    'sh000300': '000300.SH',
+    'sh000905': '000905.SH',
+    'sh000016': '000016.SH',
+    'sh000852': '000852.SH',
+}
+
+# 情绪关键词：每个极性编译为一个正则，单次扫描即可判断是否命中
+POSITIVE_KEYWORDS = ('利好', '上涨', '涨停', '突破', '增长', '反弹', '大涨', '看涨')
+NEGATIVE_KEYWORDS = ('利空', '下跌', '跌停', '回落', '下滑', '大跌', '看跌', '风险')
+POSITIVE_RE = re.compile('|'.join(map(re.escape, POSITIVE_KEYWORDS)))
+NEGATIVE_RE = re.compile('|'.join(map(re.escape, NEGATIVE_KEYWORDS)))
+
+
+def _calc_basis(futures_price: float, spot_price: float, days_to_expiry: int) -> Dict:
+    """计算基差、基差率、年化基差率（保留两位小数）"""
+    basis = futures_price - spot_price
+    basis_percent = (basis / spot_price) * 100
+    annualized_basis = basis_percent * (TRADING_DAYS_PER_YEAR / days_to_expiry)
+    return {
+        'basis': round(basis, 2),
+        'basis_percent': round(basis_percent, 2),
+        'annualized_basis': round(annualized_basis, 2),
+    }
+
 
 class Analyzer:
     """数据分析器"""
@@ -55,10 +93,14 @@ class Analyzer:
         if date is None:
             date = datetime.now().strftime("%Y-%m-%d")
         
-        # 加载数据
-        market_data = self.storage.load_market(date)
-        futures_data = self.storage.load_futures(date)
-        news_data = self.storage.load_news(date)
+        # 加载数据（三个文件相互独立，并发读取）
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            market_future = executor.submit(self.storage.load_market, date)
+            futures_future = executor.submit(self.storage.load_futures, date)
+            news_future = executor.submit(self.storage.load_news, date)
+        market_data = market_future.result()
+        futures_data = futures_future.result()
+        news_data = news_future.result()
         
         # 执行各项分析
         market_analysis = self.analyze_market(market_data)
@@ -156,13 +198,7 @@ class Analyzer:
         
         data = market_data['data']
         
-        # 涨跌幅排行
-        changes = sorted(
-            data,
-            key=lambda x: x.get('pct_chg', 0),
-            reverse=True
-        )
-        
+        # 涨跌幅排行：先投影出所需字段，再原地排序
         daily_changes = [
             {
                 'name': item.get('name', ''),
@@ -172,8 +208,13 @@ class Analyzer:
                 'volume': item.get('volume', 0),
                 'amount': item.get('amount', 0),  # 单位是千元
             }
-            for item in changes
+            for item in data
         ]
+        daily_changes.sort(key=itemgetter('change_percent'), reverse=True)
+        
+        # 今日成交额（千元转亿元）
+        volumes = [item['amount'] / 100000 for item in daily_changes]
+        today_amount = sum(volumes)
         
         # 成交量趋势 - 从 market_data 中获取
         volume_history = market_data.get('volume_history', {})
@@ -183,12 +224,8 @@ class Analyzer:
             total_volume = sum(daily_amounts) if daily_amounts else 0
         else:
             # 备选：使用当日数据
-            volumes = [item.get('amount', 0) / 100000 for item in changes]  # 千元转亿元
-            avg_volume = sum(volumes) / len(volumes) if volumes else 0
-            total_volume = sum(volumes) if volumes else 0
-        
-        # 今日成交额
-        today_amount = sum(item.get('amount', 0) / 100000 for item in changes) if changes else 0
+            avg_volume = today_amount / len(volumes) if volumes else 0
+            total_volume = today_amount
         
         if avg_volume > 0:
             if today_amount > avg_volume * 1.2:
@@ -246,24 +283,9 @@ class Analyzer:
         
         results = []
         
-        # 只获取隔季合约
-        contracts = [
-            ('IF', '沪深300', '隔季', 'IF2609', 136),
-            ('IC', '中证500', '隔季', 'IC2609', 136),
-            ('IH', '上证50', '隔季', 'IH2609', 136),
-            ('IM', '中证1000', '隔季', 'IM2609', 136),
-        ]
-        
         # 获取指数收盘价
-        index_codes = {
-            'sh000300': '000300.SH',
-            'sh000905': '000905.SH',
-            'sh000016': '000016.SH',
-            'sh000852': '000852.SH',
-        }
-        
         spot_prices = {}
-        for sh_code, ts_code in index_codes.items():
+        for sh_code, ts_code in SPOT_TS_CODES.items():
             try:
                 df = pro.index_daily(ts_code=ts_code, start_date=date, end_date=date)
                 if len(df) > 0:
@@ -272,9 +294,9 @@ class Analyzer:
                 pass
         
         # 获取期货数据
-        for fut_code, index_name, contract_type, contract_name, days_to_expiry in contracts:
-            spot_code = FUTURES_SPOT_MAP.get(fut_code, ('', ''))[0] if isinstance(FUTURES_SPOT_MAP[fut_code], tuple) else FUTURES_SPOT_MAP[fut_code]
-            spot_price = spot_prices.get(spot_code)
+        spot_of = FUTURES_SPOT_MAP.get
+        for fut_code, index_name, contract_type, contract_name, days_to_expiry in BASIS_CONTRACTS:
+            spot_price = spot_prices.get(spot_of(fut_code, ('', ''))[0])
             
             if not spot_price:
                 continue
@@ -292,27 +314,18 @@ class Analyzer:
             if not futures_price:
                 continue
             
-            # 计算基差
-            basis = futures_price - spot_price
-            basis_percent = (basis / spot_price) * 100
-            
-            # 计算年化基差率
-            annualized_basis = basis_percent * (TRADING_DAYS_PER_YEAR / days_to_expiry)
-            
             results.append({
                 'index': fut_code,
                 'index_name': index_name,
                 'contract': contract_type,
                 'futures_price': round(futures_price, 2),
                 'spot_price': round(spot_price, 2),
-                'basis': round(basis, 2),
-                'basis_percent': round(basis_percent, 2),
-                'annualized_basis': round(annualized_basis, 2),
+                **_calc_basis(futures_price, spot_price, days_to_expiry),
                 'trading_days': days_to_expiry,
             })
         
         # 按年化基差率排序
-        results.sort(key=lambda x: x['annualized_basis'], reverse=True)
+        results.sort(key=itemgetter('annualized_basis'), reverse=True)
         
         return results
     
@@ -366,13 +379,7 @@ class Analyzer:
             # 优先使用期货数据中自带的现货价格，否则从spot_prices获取
             spot_price = f.get('spot_price')
             if not spot_price:
-                spot_code_map = {
-                    'IF': 'sh000300',
-                    'IC': 'sh000905',
-                    'IH': 'sh000016',
-                    'IM': 'sh000852'
-                }
-                spot_code = spot_code_map.get(code)
+                spot_code = FUTURES_SPOT_MAP.get(code, ('', ''))[0]
                 spot_price = spot_prices.get(spot_code)
             
             if not spot_price:
@@ -383,13 +390,8 @@ class Analyzer:
             if not futures_price:
                 continue
             
-            # 计算基差
-            basis = futures_price - spot_price
-            basis_percent = (basis / spot_price) * 100
-            
             # 年化基差率（使用收盘价，距到期136天）
             days_to_expiry = 136
-            annualized_basis = basis_percent * (TRADING_DAYS_PER_YEAR / days_to_expiry)
             
             results.append({
                 'index': name,
@@ -397,14 +399,12 @@ class Analyzer:
                 'contract': '隔季',
                 'futures_price': futures_price,
                 'spot_price': spot_price,
-                'basis': round(basis, 2),
-                'basis_percent': round(basis_percent, 2),
-                'annualized_basis': round(annualized_basis, 2),
+                **_calc_basis(futures_price, spot_price, days_to_expiry),
                 'trading_days': days_to_expiry
             })
         
         # 按年化基差率排序
-        results.sort(key=lambda x: x['annualized_basis'], reverse=True)
+        results.sort(key=itemgetter('annualized_basis'), reverse=True)
         
         return results
     
@@ -422,62 +422,54 @@ class Analyzer:
         
         data = news_data['data']
         
-        # 所有新闻（用于展示标题）
+        # 所有新闻（用于展示标题），只构建最新20条
         all_news = [
             {
                 'title': item.get('title', ''),
                 'category': item.get('category', ''),
                 'source': item.get('source', ''),
             }
-            for item in data
-        ][:20]  # 保留最新20条
+            for item in islice(data, 20)
+        ]
         
-        # 高重要性新闻
-        high_importance = [
-            {
-                'title': item.get('title', ''),
-                'category': item.get('category', ''),
-                'source': item.get('source', ''),
-                'importance': item.get('importance', '')
-            }
-            for item in data
-            if item.get('importance') == '高'
-        ][:5]
+        # 单次遍历：高重要性新闻、分类统计、情绪关键词计数
+        high_importance = []
+        categories = Counter()
+        positive_count = 0
+        negative_count = 0
         
-        # 分类统计
-        categories = {}
         for item in data:
-            cat = item.get('category', '其他')
-            categories[cat] = categories.get(cat, 0) + 1
+            categories[item.get('category', '其他')] += 1
+            
+            if len(high_importance) < 5 and item.get('importance') == '高':
+                high_importance.append({
+                    'title': item.get('title', ''),
+                    'category': item.get('category', ''),
+                    'source': item.get('source', ''),
+                    'importance': item.get('importance', '')
+                })
+            
+            # 关键词均为中文，无需 lower()
+            text = item.get('title', '') + item.get('summary', '')
+            if POSITIVE_RE.search(text):
+                positive_count += 1
+            if NEGATIVE_RE.search(text):
+                negative_count += 1
         
         # 市场情绪判断
-        sentiment = self._judge_sentiment(data)
+        sentiment = self._judge_sentiment(positive_count, negative_count)
         
         return {
             'count': len(data),
             'summary': f'共{len(data)}条新闻',
             'high_importance': high_importance,
             'all_news': all_news,
-            'categories': categories,
+            'categories': dict(categories),
             'sentiment': sentiment
         }
     
-    def _judge_sentiment(self, news_data: List[Dict]) -> str:
-        """判断市场情绪"""
-        positive_keywords = ['利好', '上涨', '涨停', '突破', '增长', '反弹', '大涨', '看涨']
-        negative_keywords = ['利空', '下跌', '跌停', '回落', '下滑', '大跌', '看跌', '风险']
-        
-        positive_count = 0
-        negative_count = 0
-        
-        for item in news_data:
-            text = (item.get('title', '') + item.get('summary', '')).lower()
-            
-            if any(kw in text for kw in positive_keywords):
-                positive_count += 1
-            if any(kw in text for kw in negative_keywords):
-                negative_count += 1
-        
+    def _judge_sentiment(self, positive_count: int, negative_count: int) -> str:
+        """根据正负面新闻数量判断市场情绪"""
         if positive_count > negative_count + 2:
             return '偏多'
         elif negative_count > positive_count + 2:
@@ -538,6 +530,7 @@ class Analyzer:
 def main():
     """命令行入口"""
     import sys
+    from utils.json_codec import dumps
     
     analyzer = Analyzer()
     
@@ -545,33 +538,40 @@ def main():
     result = analyzer.analyze(date)
     
     if len(sys.argv) > 2 and sys.argv[2] == '--json':
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        print(dumps(result))
     else:
+        # 先拼好全部输出，最后一次性写出
+        lines = []
+        
         # 打印涨跌幅排行
-        print("📈 涨跌幅排行")
-        print("-" * 40)
+        lines.append("📈 涨跌幅排行")
+        lines.append("-" * 40)
         
         changes = result['market']['changes']['daily']
         for item in changes:
             change = f"{item['change_percent']:+.2f}%"
-            print(f"{item['name']:8s}: {item['price']:>8.2f}  {change}")
+            lines.append(f"{item['name']:8s}: {item['close']:>8.2f}  {change}")
         
         # 打印基差分析
-        if result['basis']:
-            print("\n📊 基差分析")
-            print("-" * 40)
+        basis = result['basis']
+        if basis:
+            lines.append("\n📊 基差分析")
+            lines.append("-" * 40)
             
-            for item in result['basis']:
+            for item in basis:
                 arrow = "↓" if item['basis'] < 0 else "↑"
                 ann = f"{item['annualized_basis']:+.2f}%"
-                print(f"{item['index']}{item['contract']:2s}: 现{item['spot_price']:.2f} 期{item['futures_price']:.2f} {arrow}{abs(item['basis']):.2f} ({ann})")
+                lines.append(f"{item['index']}{item['contract']:2s}: 现{item['spot_price']:.2f} 期{item['futures_price']:.2f} {arrow}{abs(item['basis']):.2f} ({ann})")
         
         # 打印结论
-        print("\n📋 综合结论")
-        print("-" * 40)
-        print(f"判断: {result['conclusion']['market_view']}")
-        for rec in result['conclusion']['recommendations']:
-            print(f"- {rec}")
+        conclusion = result['conclusion']
+        lines.append("\n📋 综合结论")
+        lines.append("-" * 40)
+        lines.append(f"判断: {conclusion['market_view']}")
+        for rec in conclusion['recommendations']:
+            lines.append(f"- {rec}")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
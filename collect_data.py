@@ -16,6 +16,7 @@ import os
 import sys
 import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Tuple, List, Dict
 
@@ -29,6 +30,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 新闻在后台线程写库，与主流程写入冲突时等待锁的秒数
+SQLITE_LOCK_TIMEOUT = 30
+
 
 def get_db_latest_date(table_name: str, date_column: str = 'trade_date') -> Optional[str]:
     """获取数据库中某类数据的最新日期"""
@@ -53,7 +57,8 @@ def get_db_latest_date(table_name: str, date_column: str = 'trade_date') -> Opti
     return None
 
 
-def calculate_date_range(table_name: str, date_column: str = None, days_back: int = 365) -> Tuple[str, str]:
+def calculate_date_range(table_name: str, date_column: str = None, days_back: int = 365,
+                         today: datetime = None) -> Tuple[str, str]:
     """
     计算数据采集的时间范围
     逻辑：读取数据库最新日期，与今天比较，采集中间缺失的数据
@@ -62,6 +67,7 @@ def calculate_date_range(table_name: str, date_column: str = None, days_back: in
         table_name: 数据库表名
         date_column: 日期列名 (如果为None，使用默认列名)
         days_back: 如果没有历史数据，默认往前取多少天
+        today: 本次采集的基准时刻，默认当前时间
     
     Returns:
         (start_date, end_date) 格式：YYYYMMDD 或 YYYYMM
@@ -92,8 +98,9 @@ def calculate_date_range(table_name: str, date_column: str = None, days_back: in
     
     # 判断是日期还是月度
     is_monthly = date_column in ['month', 'quarter']
-    today_str = datetime.now().strftime('%Y%m') if is_monthly else datetime.now().strftime('%Y%m%d')
-    today = datetime.now()
+    if today is None:
+        today = datetime.now()
+    today_str = today.strftime('%Y%m') if is_monthly else today.strftime('%Y%m%d')
     
     # 尝试获取数据库最新日期
     latest_date = get_db_latest_date(table_name, date_column)
@@ -405,8 +412,8 @@ def collect_etf_index_data(start_date: str = None, end_date: str = None) -> Dict
         return {'status': 'error', 'message': str(e)}
 
 
-def collect_news_data() -> Dict:
-    """采集新闻数据并写入数据库"""
+def collect_news_data(news_date: str = None) -> Dict:
+    """采集新闻数据并写入数据库，news_date 为写入的日期（YYYY-MM-DD），默认今天"""
     import sqlite3
     
     try:
@@ -420,36 +427,44 @@ def collect_news_data() -> Dict:
             return {'status': 'warning', 'message': 'No news data collected'}
         
         # 2. 直接从结果中获取数据写入数据库
-        news_date = datetime.now().strftime('%Y-%m-%d')
+        news_date = news_date or datetime.now().strftime('%Y-%m-%d')
         news_list = result.get('data', {}).get('news', [])
         
         if not news_list:
             logger.warning("No news items in result")
             return {'status': 'warning', 'message': 'No news items'}
         
-        # 写入数据库
+        # 写入数据库；本函数在后台线程运行，主流程可能同时写库，等待锁释放而不是立即失败
         db_path = os.path.join(project_root, 'data', 'market_data.db')
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        conn = sqlite3.connect(db_path, timeout=SQLITE_LOCK_TIMEOUT)
         inserted = 0
         
-        for news in news_list:
-            try:
-                cursor.execute(
-                    'INSERT OR IGNORE INTO news (date, title, summary, source, url) VALUES (?, ?, ?, ?, ?)',
-                    (news_date, news.get('title', ''), '', news.get('source', ''), news.get('url', ''))
-                )
-                if cursor.rowcount > 0:
-                    inserted += 1
-            except Exception as e:
-                logger.debug(f"Insert error: {e}")
-        
-        conn.commit()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            for news in news_list:
+                try:
+                    cursor.execute(
+                        'INSERT OR IGNORE INTO news (date, title, summary, source, url) VALUES (?, ?, ?, ?, ?)',
+                        (news_date, news.get('title', ''), '', news.get('source', ''), news.get('url', ''))
+                    )
+                    if cursor.rowcount > 0:
+                        inserted += 1
+                except sqlite3.OperationalError:
+                    # 数据库被锁或表结构问题，后续行同样会失败，交给外层记录
+                    raise
+                except Exception as e:
+                    logger.debug(f"Insert error: {e}")
+            
+            conn.commit()
+        finally:
+            conn.close()
         
         logger.info(f"✓ News: {len(news_list)} collected, {inserted} written to DB")
         return {'status': 'ok', 'collected': len(news_list), 'inserted': inserted}
         
+    except sqlite3.OperationalError as e:
+        logger.error(f"✗ News DB write failed (database locked?): {e}")
+        return {'status': 'error', 'message': str(e)}
     except Exception as e:
         logger.error(f"✗ News collection failed: {e}")
         return {'status': 'error', 'message': str(e)}
@@ -495,59 +510,75 @@ def main():
     
     idx = 0
     
-    # 1. 股票指数数据
-    if 'stock' in target_types:
-        idx += 1
-        logger.info(f"\n[{idx}/{len(target_types)}] 股票指数数据...")
-        start_date, end_date = calculate_date_range('stock_indices', 'trade_date', days_back=30)
-        result = collect_stock_data(start_date, end_date)
-    
-    # 2. 宏观经济数据
-    if 'macro' in target_types:
-        idx += 1
-        logger.info(f"\n[{idx}/{len(target_types)}] 宏观经济数据...")
-        start_date, end_date = calculate_date_range('macro_indicators', 'month', days_back=24)
-        result = collect_macro_data(start_date, end_date)
-    
-    # 3. 资金流向数据
-    if 'fund_flow' in target_types:
-        idx += 1
-        logger.info(f"\n[{idx}/{len(target_types)}] 资金流向数据...")
-        start_date, end_date = calculate_date_range('fund_flow', 'trade_date', days_back=30)
-        result = collect_fund_flow_data(start_date, end_date)
+    # 整个采集过程使用同一时刻，避免跨零点时各步骤日期不一致
+    started_at = datetime.now()
     
-    # 4. 期货数据
-    if 'futures' in target_types:
-        idx += 1
-        logger.info(f"\n[{idx}/{len(target_types)}] 期货数据...")
-        start_date, end_date = calculate_date_range('futures_daily', 'trade_date', days_back=30)
-        result = collect_futures_data(start_date, end_date)
-    
-    # 5. 货币供应量数据
-    if 'money_supply' in target_types:
-        idx += 1
-        logger.info(f"\n[{idx}/{len(target_types)}] 货币供应量数据...")
-        from collectors.tushare_macro_collector import MoneySupplyCollector
-        config = load_config()
-        try:
-            collector = MoneySupplyCollector(config)
-            start_date, end_date = calculate_date_range('money_supply', 'month', days_back=24)
-            result = collector.run(start_date=start_date, end_date=end_date)
-            logger.info(f"✓ Money supply data collected")
-        except Exception as e:
-            logger.error(f"✗ Money supply collection failed: {e}")
-    
-    # 6. ETF规模数据和指数成分股
-    if 'etf_index' in target_types:
-        idx += 1
-        logger.info(f"\n[{idx}/{len(target_types)}] ETF规模数据和指数成分股...")
-        result = collect_etf_index_data()
-    
-    # 7. 新闻数据
+    # 新闻来自网页源，与其余采集互不依赖，先在后台线程开始采集；
+    # 其余各项共享 TuShare 频率限制，仍按顺序执行
+    news_executor = None
+    news_future = None
     if 'news' in target_types:
-        idx += 1
-        logger.info(f"\n[{idx}/{len(target_types)}] 新闻数据...")
-        result = collect_news_data()
+        news_executor = ThreadPoolExecutor(max_workers=1)
+        news_future = news_executor.submit(collect_news_data, started_at.strftime('%Y-%m-%d'))
+    
+    # 前面任一步骤抛出异常时也要关闭后台线程池
+    try:
+        # 1. 股票指数数据
+        if 'stock' in target_types:
+            idx += 1
+            logger.info(f"\n[{idx}/{len(target_types)}] 股票指数数据...")
+            start_date, end_date = calculate_date_range('stock_indices', 'trade_date', days_back=30, today=started_at)
+            result = collect_stock_data(start_date, end_date)
+        
+        # 2. 宏观经济数据
+        if 'macro' in target_types:
+            idx += 1
+            logger.info(f"\n[{idx}/{len(target_types)}] 宏观经济数据...")
+            start_date, end_date = calculate_date_range('macro_indicators', 'month', days_back=24, today=started_at)
+            result = collect_macro_data(start_date, end_date)
+        
+        # 3. 资金流向数据
+        if 'fund_flow' in target_types:
+            idx += 1
+            logger.info(f"\n[{idx}/{len(target_types)}] 资金流向数据...")
+            start_date, end_date = calculate_date_range('fund_flow', 'trade_date', days_back=30, today=started_at)
+            result = collect_fund_flow_data(start_date, end_date)
+        
+        # 4. 期货数据
+        if 'futures' in target_types:
+            idx += 1
+            logger.info(f"\n[{idx}/{len(target_types)}] 期货数据...")
+            start_date, end_date = calculate_date_range('futures_daily', 'trade_date', days_back=30, today=started_at)
+            result = collect_futures_data(start_date, end_date)
+        
+        # 5. 货币供应量数据
+        if 'money_supply' in target_types:
+            idx += 1
+            logger.info(f"\n[{idx}/{len(target_types)}] 货币供应量数据...")
+            from collectors.tushare_macro_collector import MoneySupplyCollector
+            config = load_config()
+            try:
+                collector = MoneySupplyCollector(config)
+                start_date, end_date = calculate_date_range('money_supply', 'month', days_back=24, today=started_at)
+                result = collector.run(start_date=start_date, end_date=end_date)
+                logger.info(f"✓ Money supply data collected")
+            except Exception as e:
+                logger.error(f"✗ Money supply collection failed: {e}")
+        
+        # 6. ETF规模数据和指数成分股
+        if 'etf_index' in target_types:
+            idx += 1
+            logger.info(f"\n[{idx}/{len(target_types)}] ETF规模数据和指数成分股...")
+            result = collect_etf_index_data()
+        
+        # 7. 新闻数据（已在后台采集，这里等待结果）
+        if news_future is not None:
+            idx += 1
+            logger.info(f"\n[{idx}/{len(target_types)}] 新闻数据...")
+            result = news_future.result()
+    finally:
+        if news_executor is not None:
+            news_executor.shutdown()
     
     logger.info("\n" + "=" * 50)
     logger.info("数据采集完成")
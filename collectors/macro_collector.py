@@ -378,9 +378,10 @@ class MacroCollector(BaseCollector):
     
     def transform(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """转换数据格式"""
+        now = datetime.now()
         return {
-            'date': datetime.now().strftime('%Y-%m'),
-            'timestamp': datetime.now().isoformat(),
+            'date': now.strftime('%Y-%m'),
+            'timestamp': now.isoformat(),
             'source': 'TuShare',
             'type': 'macro',
             'data': raw_data
@@ -429,13 +430,17 @@ class StockCollector(BaseCollector):
         
         from datetime import datetime, timedelta
         
+        now = datetime.now()
+        start = (now - timedelta(days=5)).strftime('%Y%m%d')
+        end = now.strftime('%Y%m%d')
+        
         indices = []
         for ts_code, name in self.INDEX_CODES.items():
             try:
                 df = self.pro.index_daily(
                     ts_code=ts_code,
-                    start_date=(datetime.now() - timedelta(days=5)).strftime('%Y%m%d'),
-                    end_date=datetime.now().strftime('%Y%m%d')
+                    start_date=start,
+                    end_date=end
                 )
                 if df is not None and len(df) > 0:
                     latest = df.iloc[-1].to_dict()
@@ -449,7 +454,8 @@ class StockCollector(BaseCollector):
     
     def transform(self, raw_data) -> Dict[str, Any]:
         """转换数据格式"""
-        date_str = datetime.now().strftime('%Y-%m-%d')
+        now = datetime.now()
+        date_str = now.strftime('%Y-%m-%d')
         
         indices = []
         for item in raw_data:
@@ -473,7 +479,7 @@ class StockCollector(BaseCollector):
         
         return {
             'date': date_str,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now.isoformat(),
             'source': 'TuShare',
             'type': 'stock',
             'indices': indices
@@ -579,9 +585,10 @@ class FuturesCollector(BaseCollector):
         return data
     
     def transform(self, raw_data) -> Dict[str, Any]:
+        now = datetime.now()
         return {
-            'date': datetime.now().strftime('%Y-%m-%d'),
-            'timestamp': datetime.now().isoformat(),
+            'date': now.strftime('%Y-%m-%d'),
+            'timestamp': now.isoformat(),
             'source': 'TuShare',
             'type': 'futures',
             'data': raw_data
@@ -646,9 +653,10 @@ class GlobalMarketCollector(BaseCollector):
         return data
     
     def transform(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+        now = datetime.now()
         return {
-            'date': datetime.now().strftime('%Y-%m-%d'),
-            'timestamp': datetime.now().isoformat(),
+            'date': now.strftime('%Y-%m-%d'),
+            'timestamp': now.isoformat(),
             'source': 'TuShare',
             'type': 'global_market',
             'data': raw_data
@@ -704,9 +712,10 @@ class FundFlowCollector(BaseCollector):
         
         # 北向资金 - 沪深港通资金流向
         try:
+            now = datetime.now()
             df = self.pro.moneyflow_hsgt(
-                start_date=(datetime.now() - timedelta(days=30)).strftime('%Y%m%d'),
-                end_date=datetime.now().strftime('%Y%m%d')
+                start_date=(now - timedelta(days=30)).strftime('%Y%m%d'),
+                end_date=now.strftime('%Y%m%d')
             )
             if df is not None and len(df) > 0:
                 data['north_south'] = df.to_dict('records')
@@ -726,9 +735,10 @@ class FundFlowCollector(BaseCollector):
         return data
     
     def transform(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+        now = datetime.now()
         return {
-            'date': datetime.now().strftime('%Y-%m-%d'),
-            'timestamp': datetime.now().isoformat(),
+            'date': now.strftime('%Y-%m-%d'),
+            'timestamp': now.isoformat(),
             'source': 'TuShare',
             'type': 'fund_flow',
             'data': raw_data
@@ -784,9 +794,10 @@ class FundCollector(BaseCollector):
         return data
     
     def transform(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+        now = datetime.now()
         return {
-            'date': datetime.now().strftime('%Y-%m-%d'),
-            'timestamp': datetime.now().isoformat(),
+            'date': now.strftime('%Y-%m-%d'),
+            'timestamp': now.isoformat(),
             'source': 'TuShare',
             'type': 'fund',
             'data': raw_data
@@ -824,9 +835,10 @@ class BondCollector(BaseCollector):
         return []
     
     def transform(self, raw_data) -> Dict[str, Any]:
+        now = datetime.now()
         return {
-            'date': datetime.now().strftime('%Y-%m-%d'),
-            'timestamp': datetime.now().isoformat(),
+            'date': now.strftime('%Y-%m-%d'),
+            'timestamp': now.isoformat(),
             'source': 'TuShare',
             'type': 'convertible_bond',
             'data': raw_data
@@ -4,8 +4,8 @@
 """
 import os
 import sys
-import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 # 添加项目根目录
@@ -14,11 +14,31 @@ sys.path.insert(0, project_root)
 
 import tushare as ts
 from collectors.base import get_tushare_token
+from utils.json_codec import dumps
 
 
 class FuturesCollector:
     """期货数据采集器 - 使用TuShare"""
     
+    # 并发请求合约日线的线程数（受TuShare频率限制约束，不宜过大）
+    MAX_WORKERS = 8
+    
+    # fut_daily 单次调用返回行数上限，达到上限说明结果可能被截断
+    FUT_DAILY_ROW_LIMIT = 2000
+    
+    # 股指期货合约列表
+    # 当月(2603)，下月(2604)，下季(2606)，隔季(2609)
+    CONTRACTS = (
+        # 当月合约 (2603)
+        'IF2603.CFX', 'IC2603.CFX', 'IH2603.CFX', 'IM2603.CFX',
+        # 下月合约 (2604)
+        'IF2604.CFX', 'IC2604.CFX', 'IH2604.CFX', 'IM2604.CFX',
+        # 下季合约 (2606)
+        'IF2606.CFX', 'IC2606.CFX', 'IH2606.CFX', 'IM2606.CFX',
+        # 隔季合约 (2609)
+        'IF2609.CFX', 'IC2609.CFX', 'IH2609.CFX', 'IM2609.CFX',
+    )
+    
     def __init__(self, config):
         self.config = config
         token = config.get('tushare_token', '')
@@ -47,11 +67,13 @@ class FuturesCollector:
         
         data = {}
         
+        now = datetime.now()
+        
         # 如果没有提供日期，使用默认
         if not start_date:
-            start_date = (datetime.now() - timedelta(days=60)).strftime('%Y%m%d')
+            start_date = (now - timedelta(days=60)).strftime('%Y%m%d')
         if not end_date:
-            end_date = datetime.now().strftime('%Y%m%d')
+            end_date = now.strftime('%Y%m%d')
         
         today = end_date
         
@@ -70,34 +92,28 @@ class FuturesCollector:
         
         # 2. 获取期货日线数据（近30天）- 采集所有合约
         try:
-            start_date = (datetime.now() - timedelta(days=60)).strftime('%Y%m%d')
-            df_daily = []
+            start_date = (now - timedelta(days=60)).strftime('%Y%m%d')
             
-            # 股指期货合约列表
-            # 当月(2603)，下月(2604)，下季(2606)，隔季(2609)
-            contracts = [
-                # 当月合约 (2603)
-                'IF2603.CFX', 'IC2603.CFX', 'IH2603.CFX', 'IM2603.CFX',
-                # 下月合约 (2604)
-                'IF2604.CFX', 'IC2604.CFX', 'IH2604.CFX', 'IM2604.CFX',
-                # 下季合约 (2606)
-                'IF2606.CFX', 'IC2606.CFX', 'IH2606.CFX', 'IM2606.CFX',
-                # 隔季合约 (2609)
-                'IF2609.CFX', 'IC2609.CFX', 'IH2609.CFX', 'IM2609.CFX',
-            ]
+            contracts = self.CONTRACTS
             
-            for code in contracts:
-                try:
-                    df = self.pro.fut_daily(ts_code=code, start_date=start_date, end_date=today)
-                    if df is not None and len(df) > 0:
-                        df_daily.append(df)
-                        self.logger.info(f"  {code}: {len(df)} records")
-                except Exception as e:
-                    self.logger.warning(f"Futures daily {code} fetch failed: {e}")
+            # 优先按交易所一次性获取
+            df_all = self._fetch_daily_batch(contracts, start_date, today)
+            
+            if df_all is None:
+                # 批量结果不可用，逐合约并发获取；map 保持合约顺序
+                workers = min(self.MAX_WORKERS, len(contracts))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    frames = executor.map(
+                        lambda code: self._fetch_contract_daily(code, start_date, today),
+                        contracts
+                    )
+                    df_daily = [df for df in frames if df is not None]
+                
+                if df_daily:
+                    import pandas as pd
+                    df_all = pd.concat(df_daily, ignore_index=True)
             
-            if df_daily:
-                import pandas as pd
-                df_all = pd.concat(df_daily, ignore_index=True)
+            if df_all is not None and len(df_all) > 0:
                 data['fut_daily'] = df_all.to_dict('records')
                 self.logger.info(f"Futures daily: {len(data['fut_daily'])} records")
         except Exception as e:
@@ -108,6 +124,37 @@ class FuturesCollector:
             'data': data
         }
     
+    def _fetch_daily_batch(self, contracts, start_date: str, end_date: str):
+        """按交易所一次性获取合约日线，失败、结果可能被截断或缺少任一合约时返回None"""
+        try:
+            df = self.pro.fut_daily(exchange='CFFEX', start_date=start_date, end_date=end_date)
+        except Exception as e:
+            self.logger.warning(f"Futures daily batch fetch failed: {e}")
+            return None
+        
+        if df is None or len(df) >= self.FUT_DAILY_ROW_LIMIT:
+            return None
+        
+        df = df[df['ts_code'].isin(contracts)]
+        missing = set(contracts).difference(df['ts_code'].unique())
+        if missing:
+            self.logger.info(f"  batch missing {len(missing)} contracts, fetching per contract")
+            return None
+        
+        self.logger.info(f"  batch: {len(df)} records for {df['ts_code'].nunique()} contracts")
+        return df
+    
+    def _fetch_contract_daily(self, code: str, start_date: str, end_date: str):
+        """获取单个合约的日线数据，失败或无数据时返回None"""
+        try:
+            df = self.pro.fut_daily(ts_code=code, start_date=start_date, end_date=end_date)
+            if df is not None and len(df) > 0:
+                self.logger.info(f"  {code}: {len(df)} records")
+                return df
+        except Exception as e:
+            self.logger.warning(f"Futures daily {code} fetch failed: {e}")
+        return None
+    
     def run(self, data_dir='data', start_date: str = None, end_date: str = None):
         """运行采集器并保存数据
         
@@ -128,7 +175,7 @@ class FuturesCollector:
             os.makedirs(data_dir, exist_ok=True)
             
             with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
+                f.write(dumps(result, default=str))
             
             self.logger.info(f"Data saved to {output_file}")
             
@@ -178,7 +225,7 @@ def main():
     collector = FuturesCollector(config)
     
     result = collector.fetch()
-    print(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+    print(dumps(result, default=str))
 
 
 if __name__ == '__main__':
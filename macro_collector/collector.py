@@ -3,10 +3,41 @@
 宏观数据收集模块 - 基于 Akshare
 """
 
-import akshare as ak
-from typing import Dict, List, Optional
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+# 添加项目根目录
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from utils.cell_values import safe_float
+
+# akshare 接口结果在进程内的缓存时间（秒）
+CACHE_TTL = 60
+
+# (接口名, 参数) -> (获取时间, DataFrame)
+_df_cache: Dict[Tuple, Tuple[float, object]] = {}
+
+
+def _fetch_df(func_name: str, **kwargs):
+    """调用 akshare 接口，TTL 内直接复用上次返回的 DataFrame（调用方不得原地修改）"""
+    key = (func_name, tuple(sorted(kwargs.items())))
+    now = time.monotonic()
+    cached = _df_cache.get(key)
+    if cached and now - cached[0] < CACHE_TTL:
+        return cached[1]
+    
+    # 延迟导入：akshare 依赖链很重，只在真正取数时加载
+    import akshare as ak
+    
+    df = getattr(ak, func_name)(**kwargs)
+    _df_cache[key] = (now, df)
+    return df
+
 
 class MacroCollector:
     """宏观数据收集器 - 基于 Akshare"""
@@ -15,25 +46,26 @@ class MacroCollector:
         """获取中国主要指数"""
         results = []
         try:
-            df = ak.stock_zh_index_spot_em()
+            df = _fetch_df('stock_zh_index_spot_em')
             
             codes = ['sh000001', 'sh000300', 'sh000905', 'sh000852', 'sz399001', 'sh000016', 'sh000688', 'sz399006']
             names = {'sh000001': '上证指数', 'sh000300': '沪深300', 'sh000905': '中证500', 
                     'sh000852': '中证1000', 'sz399001': '深证成指', 'sh000016': '上证50', 
                     'sh000688': '科创50', 'sz399006': '创业板指'}
             
-            for code in codes:
-                row = df[df['代码'] == code]
-                if not row.empty:
-                    price = row.iloc[0]['最新价']
-                    change = row.iloc[0]['涨跌幅']
-                    results.append({
-                        'name': names.get(code, code),
-                        'code': code,
-                        'price': float(price) if price != '--' else 0,
-                        'change_percent': float(change) if change != '--' else 0,
-                        'currency': 'CNY'
-                    })
+            # 按代码建一次索引，避免每个代码都对全表做布尔扫描
+            indexed = df.drop_duplicates('代码').set_index('代码')
+            present = [code for code in codes if code in indexed.index]
+            sub = indexed.loc[present, ['最新价', '涨跌幅']]
+            
+            for code, price, change in zip(present, sub['最新价'], sub['涨跌幅']):
+                results.append({
+                    'name': names.get(code, code),
+                    'code': code,
+                    'price': safe_float(price),
+                    'change_percent': safe_float(change),
+                    'currency': 'CNY'
+                })
         except Exception as e:
             print(f"获取A股指数失败: {e}")
         
@@ -42,14 +74,14 @@ class MacroCollector:
     def fetch_hk_index(self) -> Optional[Dict]:
         """获取港股恒生指数"""
         try:
-            df = ak.stock_hk_index_spot_em()
+            df = _fetch_df('stock_hk_index_spot_em')
             row = df[df['代码'] == 'HSI']
             if not row.empty:
                 return {
                     'name': '恒生指数',
                     'code': 'HSI',
-                    'price': float(row.iloc[0]['最新价']),
-                    'change_percent': float(row.iloc[0]['涨跌幅']),
+                    'price': safe_float(row.iloc[0]['最新价']),
+                    'change_percent': safe_float(row.iloc[0]['涨跌幅']),
                     'currency': 'HKD'
                 }
         except Exception as e:
@@ -62,14 +94,14 @@ class MacroCollector:
         results = []
         try:
             # 道琼斯工业平均指数
-            df = ak.index_usdj(symbol="DJI")
+            df = _fetch_df('index_usdj', symbol="DJI")
             if not df.empty:
                 latest = df.iloc[-1]
                 results.append({
                     'name': '道琼斯工业指数',
                     'code': 'DJI',
-                    'price': float(latest['收盘']),
-                    'change_percent': float(latest['涨跌幅']) if '涨跌幅' in latest else 0,
+                    'price': safe_float(latest['收盘']),
+                    'change_percent': safe_float(latest.get('涨跌幅')),
                     'currency': 'USD'
                 })
         except Exception as e:
@@ -80,13 +112,14 @@ class MacroCollector:
     def fetch_gold_price(self) -> Optional[Dict]:
         """获取黄金价格"""
         try:
-            df = ak.futures_cj伦敦金属()
-            for _, row in df.iterrows():
-                name = str(row.get('品种', ''))
-                if '黄金' in name or 'Au' in name:
+            df = _fetch_df('futures_cj伦敦金属')
+            if '品种' in df.columns:
+                mask = df['品种'].astype(str).str.contains('黄金|Au')
+                if mask.any():
+                    row = df[mask].iloc[0]
                     return {
                         'name': '伦敦金',
-                        'price': float(row.get('最新价', 0)),
+                        'price': safe_float(row.get('最新价')),
                         'unit': '美元/盎司',
                         'currency': 'USD'
                     }
@@ -99,14 +132,19 @@ class MacroCollector:
         """获取中国国债收益率"""
         results = []
         try:
-            df = ak.bond_china_yield()
+            df = _fetch_df('bond_china_yield')
             if not df.empty:
-                for _, row in df.head(5).iterrows():
-                    results.append({
-                        'name': f"国债{row.get('期限', '')}年",
-                        'yield': float(row.get('收益率', 0)),
+                head = df.head(5)
+                terms = head['期限'].tolist() if '期限' in head else [''] * len(head)
+                yields = head['收益率'].astype(float).tolist() if '收益率' in head else [0.0] * len(head)
+                results = [
+                    {
+                        'name': f"国债{term}年",
+                        'yield': value,
                         'currency': 'CNY'
-                    })
+                    }
+                    for term, value in zip(terms, yields)
+                ]
         except Exception as e:
             print(f"获取国债收益率失败: {e}")
         
@@ -115,13 +153,13 @@ class MacroCollector:
     def fetch_macro_gdp(self) -> Optional[Dict]:
         """获取中国GDP"""
         try:
-            df = ak.macro_china_gdp()
+            df = _fetch_df('macro_china_gdp')
             if not df.empty:
                 latest = df.iloc[-1]
                 return {
                     'name': '中国GDP',
-                    'value': float(latest.get('GDP', 0)),
-                    'yoy': float(latest.get('GDP同比', 0)),
+                    'value': safe_float(latest.get('GDP')),
+                    'yoy': safe_float(latest.get('GDP同比')),
                     'quarter': str(latest.get('季度', ''))
                 }
         except Exception as e:
@@ -132,13 +170,13 @@ class MacroCollector:
     def fetch_macro_cpi(self) -> Optional[Dict]:
         """获取中国CPI"""
         try:
-            df = ak.macro_china_cpi()
+            df = _fetch_df('macro_china_cpi')
             if not df.empty:
                 latest = df.iloc[-1]
                 return {
                     'name': '中国CPI',
-                    'value': float(latest.get('CPI', 0)),
-                    'yoy': float(latest.get('CPI同比', 0)),
+                    'value': safe_float(latest.get('CPI')),
+                    'yoy': safe_float(latest.get('CPI同比')),
                     'month': str(latest.get('月份', ''))
                 }
         except Exception as e:
@@ -149,31 +187,37 @@ class MacroCollector:
     def collect_all(self) -> Dict:
         """收集所有宏观数据"""
         
+        now = datetime.now()
         result = {
-            'date': datetime.now().strftime("%Y-%m-%d"),
+            'date': now.strftime("%Y-%m-%d"),
             'type': 'macro',
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now.isoformat(),
             'data': {}
         }
         
-        print("📊 获取A股指数...")
-        result['data']['china_indices'] = self.fetch_china_indices()
-        
-        print("📊 获取港股指数...")
-        result['data']['hk_index'] = self.fetch_hk_index()
+        # 各接口相互独立，并发获取
+        tasks = {
+            'china_indices': self.fetch_china_indices,
+            'hk_index': self.fetch_hk_index,
+            'gdp': self.fetch_macro_gdp,
+            'cpi': self.fetch_macro_cpi,
+            'bonds': self.fetch_china_bonds,
+        }
+        print("📊 获取A股指数、港股指数、宏观指标、国债收益率...")
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            futures = {name: executor.submit(fetch) for name, fetch in tasks.items()}
+        fetched = {name: future.result() for name, future in futures.items()}
         
-        print("📊 获取宏观指标...")
-        gdp = self.fetch_macro_gdp()
-        cpi = self.fetch_macro_cpi()
+        result['data']['china_indices'] = fetched['china_indices']
+        result['data']['hk_index'] = fetched['hk_index']
         
         result['data']['macro'] = {}
-        if gdp:
-            result['data']['macro']['gdp'] = gdp
-        if cpi:
-            result['data']['macro']['cpi'] = cpi
+        if fetched['gdp']:
+            result['data']['macro']['gdp'] = fetched['gdp']
+        if fetched['cpi']:
+            result['data']['macro']['cpi'] = fetched['cpi']
         
-        print("📊 获取国债收益率...")
-        result['data']['bonds'] = self.fetch_china_bonds()
+        result['data']['bonds'] = fetched['bonds']
         
         return result
 
@@ -4,237 +4,341 @@
 用于在没有网络限制的环境下运行（如本地电脑）
 
 使用方法:
-    python3 macro_collector_local.py
+    python3 macro_collector_local.py [--no-cache] [--verbose] [--compact]
 
 输出:
-    macro_YYYY-MM-DD.json
+    macro_YYYY-MM-DD.json    缩进 JSON（--compact 时紧凑）
 """
 
 import akshare as ak
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import json
+import argparse
+import logging
 import os
+import time
+
+from utils.json_codec import dump_to_file
+from utils.cell_values import safe_float
+
+logger = logging.getLogger(__name__)
+
+# 输出目录与 akshare 返回结果的本地缓存目录
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+CACHE_DIR = os.path.join(DATA_DIR, 'cache')
+
+# 缓存有效期（秒）：盘中行情1小时，宏观指标1天
+INTRADAY_TTL = 3600
+DAILY_TTL = 86400
 
 
 class MacroCollectorLocal:
     """本地版宏观数据收集器"""
     
-    def __init__(self):
-        self.date = datetime.now().strftime("%Y-%m-%d")
+    def __init__(self, use_cache: bool = True):
+        # 日期与时间戳取自同一时刻
+        self.started_at = datetime.now()
+        self.date = self.started_at.strftime("%Y-%m-%d")
+        self.use_cache = use_cache
+    
+    def _cached_call(self, name, ttl, fetch, columns=None, numeric=()):
+        """
+        调用 akshare 接口，有效期内直接读取磁盘缓存的 DataFrame
+        
+        Args:
+            name: 缓存名（接口名及参数）
+            ttl: 缓存有效期（秒）
+            fetch: 实际获取数据的函数
+            columns: 只保留的列（接口未返回的列忽略），为None时保留全部
+            numeric: 需转为数值的列，无法解析的值记为0
+        """
+        path = os.path.join(CACHE_DIR, f"{name}.pkl")
+        if self.use_cache and os.path.exists(path) and time.time() - os.path.getmtime(path) < ttl:
+            return pd.read_pickle(path)
+        
+        df = fetch()
+        
+        # 宽表只保留用到的列，缩小缓存和后续处理的数据量
+        if columns is not None:
+            df = df[[col for col in columns if col in df.columns]].copy()
+        # assign 返回新表，接口返回的是切片时也不会链式赋值
+        numeric = [col for col in numeric if col in df.columns]
+        if numeric:
+            df = df.assign(**{col: pd.to_numeric(df[col], errors='coerce').fillna(0) for col in numeric})
+        
+        # 先写临时文件再替换，避免并发读到不完整的缓存
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+        return df
     
     def collect_all(self):
         """收集所有数据"""
         
-        print(f"📊 开始收集宏观数据 ({self.date})")
-        print("=" * 50)
+        logger.info("📊 开始收集宏观数据 (%s)", self.date)
+        logger.info("%s", "=" * 50)
         
         result = {
             'date': self.date,
             'type': 'macro',
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': self.started_at.isoformat(),
             'data': {}
         }
         
-        # A股指数
-        print("📈 获取A股指数...")
-        try:
-            df = ak.stock_zh_index_spot_em()
-            codes = {
-                'sh000001': '上证指数', 'sh000300': '沪深300', 'sh000905': '中证500',
-                'sh000852': '中证1000', 'sz399001': '深证成指', 'sh000016': '上证50',
-                'sh000688': '科创50', 'sz399006': '创业板指'
-            }
-            china_indices = []
-            for code, name in codes.items():
-                row = df[df['代码'] == code]
-                if not row.empty:
-                    price = row.iloc[0]['最新价']
-                    change = row.iloc[0]['涨跌幅']
-                    china_indices.append({
-                        'name': name, 'code': code,
-                        'price': float(price) if price != '--' else 0,
-                        'change_percent': float(change) if change != '--' else 0,
-                        'currency': 'CNY'
-                    })
-            result['data']['china_indices'] = china_indices
-            print(f"   ✅ 获取 {len(china_indices)} 个指数")
-        except Exception as e:
-            print(f"   ❌ 获取失败: {e}")
-            result['data']['china_indices'] = []
-        
-        # 港股
-        print("📈 获取港股指数...")
-        try:
-            df = ak.stock_hk_index_spot_em()
-            row = df[df['代码'] == 'HSI']
-            if not row.empty:
-                result['data']['hk_index'] = {
-                    'name': '恒生指数', 'code': 'HSI',
-                    'price': float(row.iloc[0]['最新价']),
-                    'change_percent': float(row.iloc[0]['涨跌幅']),
-                    'currency': 'HKD'
-                }
-                print(f"   ✅ 恒生指数")
-        except Exception as e:
-            print(f"   ❌ 获取失败: {e}")
-        
-        # 美股
-        print("📈 获取美股指数...")
-        try:
-            # 道琼斯
-            df = ak.index_usdj(symbol="DJI")
-            if not df.empty:
-                latest = df.iloc[-1]
-                result['data']['us_indices'] = [{
-                    'name': '道琼斯', 'code': 'DJI',
-                    'price': float(latest['收盘']),
-                    'change_percent': float(latest.get('涨跌幅', 0)),
-                    'currency': 'USD'
-                }]
-                print(f"   ✅ 道琼斯指数")
-        except Exception as e:
-            print(f"   ❌ 获取失败: {e}")
+        # (数据键, 提示, 获取函数)，各接口相互独立
+        sections = [
+            ('china_indices', '获取A股指数', self._fetch_china_indices),
+            ('hk_index', '获取港股指数', self._fetch_hk_index),
+            ('us_indices', '获取美股指数', self._fetch_us_indices),
+            ('gold', '获取黄金价格', self._fetch_gold),
+            ('oil', '获取原油价格', self._fetch_oil),
+            ('bonds', '获取国债收益率', self._fetch_bonds),
+            ('gdp', '获取GDP', self._fetch_gdp),
+            ('cpi', '获取CPI', self._fetch_cpi),
+        ]
         
-        # 黄金
-        print("📈 获取黄金价格...")
-        try:
-            df = ak.futures_cj伦敦金属()
-            for _, row in df.iterrows():
-                name = str(row.get('品种', ''))
-                if '黄金' in name or 'Au' in name:
-                    result['data']['gold'] = {
-                        'name': '伦敦金',
-                        'price': float(row.get('最新价', 0)),
-                        'unit': '美元/盎司',
-                        'currency': 'USD'
-                    }
-                    print(f"   ✅ 伦敦金")
-                    break
-        except Exception as e:
-            print(f"   ❌ 获取失败: {e}")
+        # 并发获取；各任务的输出先缓存，结束后按原顺序记录
+        with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+            futures = [
+                executor.submit(self._run_section, title, fetch)
+                for _, title, fetch in sections
+            ]
         
-        # 原油
-        print("📈 获取原油价格...")
-        try:
-            df = ak.futures_cj能源()
-            if not df.empty:
-                row = df.iloc[0]
-                result['data']['oil'] = {
-                    'name': row.get('品种', '原油'),
-                    'price': float(row.get('最新价', 0)),
-                    'unit': '美元/桶',
-                    'currency': 'USD'
-                }
-                print(f"   ✅ 原油价格")
-        except Exception as e:
-            print(f"   ❌ 获取失败: {e}")
+        values = {}
+        for (key, _, _), future in zip(sections, futures):
+            value, log = future.result()
+            for line in log:
+                logger.info("%s", line)
+            values[key] = value
         
-        # 国债收益率
-        print("📈 获取国债收益率...")
-        try:
-            df = ak.bond_china_yield()
-            bonds = []
-            for _, row in df.head(5).iterrows():
-                bonds.append({
-                    'name': f"国债{row.get('期限', '')}年",
-                    'yield': float(row.get('收益率', 0)),
-                    'currency': 'CNY'
-                })
-            result['data']['bonds'] = bonds
-            print(f"   ✅ {len(bonds)} 个期限")
-        except Exception as e:
-            print(f"   ❌ 获取失败: {e}")
+        data = result['data']
+        data['china_indices'] = values['china_indices'] or []
+        for key in ('hk_index', 'us_indices', 'gold', 'oil', 'bonds'):
+            if values[key] is not None:
+                data[key] = values[key]
+        for key in ('gdp', 'cpi'):
+            if values[key] is not None:
+                data.setdefault('macro', {})[key] = values[key]
         
-        # GDP
-        print("📈 获取GDP...")
-        try:
-            df = ak.macro_china_gdp()
-            if not df.empty:
-                latest = df.iloc[-1]
-                result['data']['macro'] = {
-                    'gdp': {
-                        'name': '中国GDP',
-                        'value': float(latest.get('GDP', 0)),
-                        'yoy': float(latest.get('GDP同比', 0)),
-                        'quarter': str(latest.get('季度', ''))
-                    }
-                }
-                print(f"   ✅ GDP")
-        except Exception as e:
-            print(f"   ❌ 获取失败: {e}")
+        logger.info("%s", "=" * 50)
+        logger.info("✅ 数据收集完成!")
         
-        # CPI
-        print("📈 获取CPI...")
+        return result
+    
+    @staticmethod
+    def _numeric_column(df, column):
+        """取数值列，缺失列或无法解析的值记为0"""
+        if column not in df.columns:
+            return [0.0] * len(df)
+        return pd.to_numeric(df[column], errors='coerce').fillna(0).to_numpy()
+    
+    @staticmethod
+    def _run_section(title, fetch):
+        """执行单个获取任务，返回 (数据, 输出行)；失败时数据为None"""
+        log = [f"📈 {title}..."]
         try:
-            df = ak.macro_china_cpi()
-            if not df.empty:
-                latest = df.iloc[-1]
-                if 'macro' not in result['data']:
-                    result['data']['macro'] = {}
-                result['data']['macro']['cpi'] = {
-                    'name': '中国CPI',
-                    'value': float(latest.get('CPI', 0)),
-                    'yoy': float(latest.get('CPI同比', 0)),
-                    'month': str(latest.get('月份', ''))
-                }
-                print(f"   ✅ CPI")
+            value = fetch(log)
         except Exception as e:
-            print(f"   ❌ 获取失败: {e}")
-        
-        print("=" * 50)
-        print("✅ 数据收集完成!")
+            log.append(f"   ❌ 获取失败: {e}")
+            value = None
+        return value, log
+    
+    def _fetch_china_indices(self, log):
+        """A股指数"""
+        df = self._cached_call(
+            'stock_zh_index_spot_em', INTRADAY_TTL, ak.stock_zh_index_spot_em,
+            columns=('代码', '最新价', '涨跌幅'), numeric=('最新价', '涨跌幅')
+        )
+        codes = {
+            'sh000001': '上证指数', 'sh000300': '沪深300', 'sh000905': '中证500',
+            'sh000852': '中证1000', 'sz399001': '深证成指', 'sh000016': '上证50',
+            'sh000688': '科创50', 'sz399006': '创业板指'
+        }
+        # 按代码建一次索引，避免每个代码都对全表做布尔扫描
+        indexed = df.drop_duplicates('代码').set_index('代码')
+        present = [code for code in codes if code in indexed.index]
+        sub = indexed.loc[present, ['最新价', '涨跌幅']]
         
-        return result
+        china_indices = []
+        for code, price, change in zip(present, sub['最新价'], sub['涨跌幅']):
+            china_indices.append({
+                'name': codes[code], 'code': code,
+                'price': safe_float(price),
+                'change_percent': safe_float(change),
+                'currency': 'CNY'
+            })
+        log.append(f"   ✅ 获取 {len(china_indices)} 个指数")
+        return china_indices
+    
+    def _fetch_hk_index(self, log):
+        """港股"""
+        df = self._cached_call(
+            'stock_hk_index_spot_em', INTRADAY_TTL, ak.stock_hk_index_spot_em,
+            columns=('代码', '最新价', '涨跌幅'), numeric=('最新价', '涨跌幅')
+        )
+        row = df[df['代码'] == 'HSI']
+        if not row.empty:
+            log.append(f"   ✅ 恒生指数")
+            return {
+                'name': '恒生指数', 'code': 'HSI',
+                'price': safe_float(row.iloc[0]['最新价']),
+                'change_percent': safe_float(row.iloc[0]['涨跌幅']),
+                'currency': 'HKD'
+            }
+        return None
+    
+    def _fetch_us_indices(self, log):
+        """美股（道琼斯）"""
+        df = self._cached_call('index_usdj_DJI', INTRADAY_TTL, lambda: ak.index_usdj(symbol="DJI"))
+        if not df.empty:
+            latest = df.iloc[-1]
+            us_indices = [{
+                'name': '道琼斯', 'code': 'DJI',
+                'price': safe_float(latest['收盘']),
+                'change_percent': safe_float(latest.get('涨跌幅')),
+                'currency': 'USD'
+            }]
+            log.append(f"   ✅ 道琼斯指数")
+            return us_indices
+        return None
     
-    def save(self, result):
-        """保存到文件"""
+    def _fetch_gold(self, log):
+        """黄金"""
+        df = self._cached_call('futures_cj伦敦金属', INTRADAY_TTL, ak.futures_cj伦敦金属)
+        if '品种' not in df.columns:
+            return None
+        hit = df.loc[df['品种'].astype(str).str.contains('黄金|Au', regex=True, na=False)]
+        if hit.empty:
+            return None
+        row = hit.iloc[0]
+        log.append(f"   ✅ 伦敦金")
+        return {
+            'name': '伦敦金',
+            'price': safe_float(row.get('最新价')),
+            'unit': '美元/盎司',
+            'currency': 'USD'
+        }
+    
+    def _fetch_oil(self, log):
+        """原油"""
+        df = self._cached_call('futures_cj能源', INTRADAY_TTL, ak.futures_cj能源)
+        if not df.empty:
+            row = df.iloc[0]
+            oil = {
+                'name': row.get('品种', '原油'),
+                'price': safe_float(row.get('最新价')),
+                'unit': '美元/桶',
+                'currency': 'USD'
+            }
+            log.append(f"   ✅ 原油价格")
+            return oil
+        return None
+    
+    def _fetch_bonds(self, log):
+        """国债收益率"""
+        df = self._cached_call(
+            'bond_china_yield', DAILY_TTL, ak.bond_china_yield,
+            columns=('期限', '收益率'), numeric=('收益率',)
+        )
+        head = df.iloc[:5]
+        terms = head['期限'].to_numpy() if '期限' in head.columns else [''] * len(head)
+        yields = self._numeric_column(head, '收益率')
+        bonds = [
+            {'name': f"国债{term}年", 'yield': float(y), 'currency': 'CNY'}
+            for term, y in zip(terms, yields)
+        ]
+        log.append(f"   ✅ {len(bonds)} 个期限")
+        return bonds
+    
+    def _fetch_gdp(self, log):
+        """GDP"""
+        df = self._cached_call('macro_china_gdp', DAILY_TTL, ak.macro_china_gdp)
+        if not df.empty:
+            latest = df.iloc[-1:]
+            gdp = {
+                'name': '中国GDP',
+                'value': float(self._numeric_column(latest, 'GDP')[0]),
+                'yoy': float(self._numeric_column(latest, 'GDP同比')[0]),
+                'quarter': str(latest['季度'].iat[0]) if '季度' in latest.columns else ''
+            }
+            log.append(f"   ✅ GDP")
+            return gdp
+        return None
+    
+    def _fetch_cpi(self, log):
+        """CPI"""
+        df = self._cached_call('macro_china_cpi', DAILY_TTL, ak.macro_china_cpi)
+        if not df.empty:
+            latest = df.iloc[-1:]
+            cpi = {
+                'name': '中国CPI',
+                'value': float(self._numeric_column(latest, 'CPI')[0]),
+                'yoy': float(self._numeric_column(latest, 'CPI同比')[0]),
+                'month': str(latest['月份'].iat[0]) if '月份' in latest.columns else ''
+            }
+            log.append(f"   ✅ CPI")
+            return cpi
+        return None
+    
+    def save(self, result, compact: bool = False):
+        """保存到文件，compact 为 True 时写紧凑 JSON"""
         # 创建输出目录
-        output_dir = os.path.join(os.path.dirname(__file__), 'data')
-        os.makedirs(output_dir, exist_ok=True)
+        os.makedirs(DATA_DIR, exist_ok=True)
         
-        filename = f"macro_{self.date}.json"
-        filepath = os.path.join(output_dir, filename)
+        filepath = os.path.join(DATA_DIR, f"macro_{self.date}.json")
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        dump_to_file(result, filepath, indent=not compact)
         
-        print(f"\n📁 数据已保存到: {filepath}")
+        logger.info("📁 数据已保存到: %s", filepath)
         return filepath
 
 
 def main():
-    collector = MacroCollectorLocal()
+    parser = argparse.ArgumentParser(description='宏观数据收集器 - 本地运行版')
+    parser.add_argument('--no-cache', action='store_true', help='忽略本地缓存，强制重新获取')
+    parser.add_argument('--verbose', action='store_true', help='输出数据汇总')
+    parser.add_argument('--compact', action='store_true', help='JSON 文件使用紧凑格式，减小文件体积')
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
+    collector = MacroCollectorLocal(use_cache=not args.no_cache)
     result = collector.collect_all()
-    collector.save(result)
+    collector.save(result, compact=args.compact)
+    
+    if not args.verbose:
+        return
     
-    print("\n" + "=" * 50)
-    print("📊 数据汇总")
-    print("=" * 50)
+    logger.info("%s", "=" * 50)
+    logger.info("📊 数据汇总")
+    logger.info("%s", "=" * 50)
     
     data = result['data']
     
     if data.get('china_indices'):
-        print(f"A股指数: {len(data['china_indices'])}个")
+        logger.info("A股指数: %d个", len(data['china_indices']))
         for idx in data['china_indices'][:3]:
-            print(f"  {idx['name']}: {idx['price']:.2f} ({idx['change_percent']:+.2f}%)")
+            logger.info("  %s: %.2f (%+.2f%%)", idx['name'], idx['price'], idx['change_percent'])
     
     if data.get('hk_index'):
         idx = data['hk_index']
-        print(f"港股: {idx['name']} {idx['price']:.2f}")
+        logger.info("港股: %s %.2f", idx['name'], idx['price'])
     
     if data.get('us_indices'):
         for idx in data['us_indices']:
-            print(f"美股: {idx['name']} {idx['price']:.2f}")
+            logger.info("美股: %s %.2f", idx['name'], idx['price'])
     
     if data.get('gold'):
-        print(f"黄金: {data['gold']['price']:.2f} 美元/盎司")
+        logger.info("黄金: %.2f 美元/盎司", data['gold']['price'])
     
     if data.get('oil'):
-        print(f"原油: {data['oil']['price']:.2f} 美元/桶")
+        logger.info("原油: %.2f 美元/桶", data['oil']['price'])
     
     if data.get('macro'):
-        for name, item in data['macro'].items():
-            print(f"{item['name']}: {item.get('value', 'N/A')}")
+        for item in data['macro'].values():
+            logger.info("%s: %s", item['name'], item.get('value', 'N/A'))
 
 
 if __name__ == "__main__":
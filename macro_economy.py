@@ -6,10 +6,14 @@
 """
 
 from datetime import datetime
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, List
+import glob
 import json
 import os
 
+from utils.json_codec import dump_to_file, dumps
+
 # 尝试导入数据库模块
 try:
     from database.db_writer import DBReader
@@ -17,12 +21,80 @@ try:
 except ImportError:
     HAS_DB = False
 
+# 数据文件目录（模块所在目录下的 data/）
+_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+# 只来自静态数据的摘要板块（数据库不写这些键）
+_STATIC_SECTION_KEYS = (
+    'retail', 'online_retail',
+    'fixed_investment', 'real_estate_investment', 'manufacturing_investment',
+    'industrial_addition',
+    'exports', 'imports', 'trade_balance',
+    'central_bank',
+)
+
+
+def _render_static_sections(data: Dict) -> List[str]:
+    """渲染消费、投资、工业、进出口、央行板块的摘要文本"""
+    sections = []
+    
+    # 消费
+    retail = data.get('retail')
+    if retail:
+        block = f"\n【消费】\n  社会消费品零售: {retail.get('yoy')}%, {retail.get('month')}"
+        online = data.get('online_retail')
+        if online:
+            block += f"\n  网上零售额同比: {online.get('yoy')}%"
+        sections.append(block)
+    
+    # 投资
+    block = "\n【投资】"
+    fi = data.get('fixed_investment')
+    if fi:
+        block += f"\n  固定资产投资: {fi.get('yoy')}%, {fi.get('month')}"
+    re = data.get('real_estate_investment')
+    if re:
+        block += f"\n  房地产投资: {re.get('yoy')}%, {re.get('month')} (全国{re.get('value')}亿元)"
+    mi = data.get('manufacturing_investment')
+    if mi:
+        block += f"\n  制造业投资: {mi.get('yoy')}%, {mi.get('month')}"
+    sections.append(block)
+    
+    # 工业
+    ia = data.get('industrial_addition')
+    if ia:
+        sections.append(f"\n【工业】\n  工业增加值: {ia.get('yoy')}%, {ia.get('month')}")
+    
+    # 进出口
+    exp = data.get('exports')
+    imp = data.get('imports')
+    if exp and imp:
+        block = (
+            f"\n【进出口】\n"
+            f"  出口: {exp.get('value')}亿美元, 同比 {exp.get('yoy')}%\n"
+            f"  进口: {imp.get('value')}亿美元, 同比 {imp.get('yoy')}%"
+        )
+        tb = data.get('trade_balance')
+        if tb:
+            block += f"\n  贸易顺差: {tb.get('value')}亿美元"
+        sections.append(block)
+    
+    # 央行
+    cb = data.get('central_bank', [])
+    if cb:
+        sections.append("\n【央行政策】\n" + "\n".join(
+            f"  {item['name']}: {item['value']}" for item in cb[:5]
+        ))
+    
+    return sections
+
 
 class MacroEconomyData:
     """宏观经济数据类"""
     
-    # 完整的静态宏观经济数据
-    STATIC_DATA = {
+    # 完整的静态宏观经济数据（只读视图，防止被调用方意外修改）
+    STATIC_DATA = MappingProxyType({
         # ============ 经济增长 ============
         'gdp': {
             'name': '中国GDP',
@@ -224,37 +296,27 @@ class MacroEconomyData:
         
         # ============ 货币供应 (从JSON文件加载) ============
         # 数据已移至 data/pboc_*.json 文件
-    }
+    })
     
-    def save_to_file(self, filepath: str = None) -> str:
-        """保存数据到JSON文件"""
-        import os
-        
-        if filepath is None:
-            date_str = datetime.now().strftime("%Y-%m-%d")
-            data_dir = os.path.join(os.path.dirname(__file__), 'data')
-            os.makedirs(data_dir, exist_ok=True)
-            filepath = os.path.join(data_dir, f"macro_{date_str}.json")
-        
+    # 静态板块的摘要文本只依赖 STATIC_DATA，类定义时渲染一次
+    _STATIC_SECTION_BLOCKS = tuple(_render_static_sections(STATIC_DATA))
+    
+    def save_to_file(self, filepath: str = None, compact: bool = False) -> str:
+        """保存数据到JSON文件，compact 为 True 时写紧凑格式"""
         result = self.get_all()
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        if filepath is None:
+            os.makedirs(_DATA_DIR, exist_ok=True)
+            filepath = os.path.join(_DATA_DIR, f"macro_{result['date']}.json")
         
+        dump_to_file(result, filepath, indent=not compact)
         return filepath
     
-    def get_all(self) -> Dict:
-        """获取所有宏观经济数据"""
-        
     def load_pboc_data(self, filepath: str = None) -> Dict:
         """从JSON文件加载央行数据"""
-        import os
-        import glob
-        
         if filepath is None:
             # 自动查找最新的pboc_*.json文件
-            data_dir = os.path.join(os.path.dirname(__file__), 'data')
-            pattern = os.path.join(data_dir, 'pboc_*.json')
+            pattern = os.path.join(_DATA_DIR, 'pboc_*.json')
             files = glob.glob(pattern)
             if not files:
                 return {}
@@ -265,13 +327,9 @@ class MacroEconomyData:
     
     def load_macro_data(self, filepath: str = None) -> Dict:
         """从JSON文件加载TuShare宏观数据"""
-        import os
-        import glob
-        
         if filepath is None:
             # 自动查找最新的macro_*.json文件 (排除formatted)
-            data_dir = os.path.join(os.path.dirname(__file__), 'data')
-            pattern = os.path.join(data_dir, 'macro_2026-*.json')
+            pattern = os.path.join(_DATA_DIR, 'macro_2026-*.json')
             files = [f for f in glob.glob(pattern) if 'formatted' not in f]
             if not files:
                 return {}
@@ -282,13 +340,9 @@ class MacroEconomyData:
     
     def load_real_estate_data(self, filepath: str = None) -> Dict:
         """从JSON文件加载房地产数据"""
-        import os
-        import glob
-        
         if filepath is None:
             # 自动查找最新的real_estate_*.json文件
-            data_dir = os.path.join(os.path.dirname(__file__), 'data')
-            pattern = os.path.join(data_dir, 'real_estate_*.json')
+            pattern = os.path.join(_DATA_DIR, 'real_estate_*.json')
             files = glob.glob(pattern)
             if not files:
                 return {}
@@ -299,13 +353,9 @@ class MacroEconomyData:
     
     def load_money_supply_data(self, filepath: str = None) -> Dict:
         """从JSON文件加载货币供应量数据 M0/M1/M2"""
-        import os
-        import glob
-        
         if filepath is None:
             # 自动查找最新的money_supply_*.json文件（排除history）
-            data_dir = os.path.join(os.path.dirname(__file__), 'data')
-            pattern = os.path.join(data_dir, 'money_supply_2026-*.json')
+            pattern = os.path.join(_DATA_DIR, 'money_supply_2026-*.json')
             files = [f for f in glob.glob(pattern) if 'history' not in f]
             if not files:
                 return {}
@@ -422,6 +472,12 @@ class MacroEconomyData:
     
     def get_all(self) -> Dict:
         """获取所有宏观经济数据（优先从数据库读取）"""
+        now = datetime.now()
+        envelope = {
+            'date': now.strftime("%Y-%m-%d"),
+            'type': 'macro_economy',
+            'timestamp': now.isoformat(),
+        }
         
         # 优先从数据库读取
         if HAS_DB:
@@ -430,151 +486,134 @@ class MacroEconomyData:
                 # 合并数据库数据和静态数据
                 all_data = dict(self.STATIC_DATA)
                 all_data.update(db_data)
-                return {
-                    'date': datetime.now().strftime("%Y-%m-%d"),
-                    'type': 'macro_economy',
-                    'timestamp': datetime.now().isoformat(),
-                    'data': all_data,
-                    'source': 'SQLite Database'
-                }
+                envelope['data'] = all_data
+                envelope['source'] = 'SQLite Database'
+                return envelope
         
         # 数据库无数据时返回错误
-        return {
-            'date': datetime.now().strftime("%Y-%m-%d"),
-            'type': 'macro_economy',
-            'timestamp': datetime.now().isoformat(),
-            'data': {},
-            'error': '数据库无可用数据，请先运行数据采集'
-        }
+        envelope['data'] = {}
+        envelope['error'] = '数据库无可用数据，请先运行数据采集'
+        return envelope
     
     def get_summary(self) -> str:
-        """获取摘要文本"""
+        """获取摘要文本（每次调用都读取最新数据）"""
+        return self._compute_summary()
+    
+    def _compute_summary(self) -> str:
+        """生成摘要文本"""
         
         # 使用get_all()获取合并后的数据
         all_data = self.get_all()
         data = all_data.get('data', {})
-        lines = []
         
-        lines.append("📊 宏观经济数据")
-        lines.append("=" * 50)
+        # 每个板块渲染为一段完整文本，最后统一拼接
+        sections = [f"📊 宏观经济数据\n{'=' * 50}"]
         
         # GDP
         gdp = data.get('gdp')
         if gdp:
-            lines.append(f"\n【{gdp['name']}】")
-            lines.append(f"  数值: {gdp.get('value')} 万亿元")
-            lines.append(f"  同比: {gdp.get('yoy')}%")
-            lines.append(f"  季度: {gdp.get('quarter')}")
+            sections.append(
+                f"\n【{gdp['name']}】\n"
+                f"  数值: {gdp.get('value')} 万亿元\n"
+                f"  同比: {gdp.get('yoy')}%\n"
+                f"  季度: {gdp.get('quarter')}"
+            )
         
         # CPI & PPI
         cpi = data.get('cpi')
         ppi = data.get('ppi')
         if cpi or ppi:
-            lines.append(f"\n【通胀数据】")
+            block = "\n【通胀数据】"
             if cpi:
-                lines.append(f"  CPI: 同比 {cpi.get('yoy')}%, 环比 {cpi.get('mom')}%, {cpi.get('month')}")
+                block += f"\n  CPI: 同比 {cpi.get('yoy')}%, 环比 {cpi.get('mom')}%, {cpi.get('month')}"
             if ppi:
-                lines.append(f"  PPI: 同比 {ppi.get('yoy')}%, {ppi.get('month')}")
+                block += f"\n  PPI: 同比 {ppi.get('yoy')}%, {ppi.get('month')}"
+            sections.append(block)
         
         # PMI
         pmi = data.get('pmi')
         if pmi:
-            lines.append(f"\n【PMI】")
-            lines.append(f"  制造业PMI: {pmi.get('value')}, {pmi.get('month')}")
+            block = f"\n【PMI】\n  制造业PMI: {pmi.get('value')}, {pmi.get('month')}"
             pmi_s = data.get('pmi_services')
             if pmi_s:
-                lines.append(f"  非制造业: {pmi_s.get('value')}")
-        
-        # 消费
-        retail = data.get('retail')
-        if retail:
-            lines.append(f"\n【消费】")
-            lines.append(f"  社会消费品零售: {retail.get('yoy')}%, {retail.get('month')}")
-            online = data.get('online_retail')
-            if online:
-                lines.append(f"  网上零售额同比: {online.get('yoy')}%")
-        
-        # 投资
-        lines.append(f"\n【投资】")
-        fi = data.get('fixed_investment')
-        if fi:
-            lines.append(f"  固定资产投资: {fi.get('yoy')}%, {fi.get('month')}")
-        re = data.get('real_estate_investment')
-        if re:
-            lines.append(f"  房地产投资: {re.get('yoy')}%, {re.get('month')} (全国{re.get('value')}亿元)")
-        mi = data.get('manufacturing_investment')
-        if mi:
-            lines.append(f"  制造业投资: {mi.get('yoy')}%, {mi.get('month')}")
-        
-        # 工业
-        ia = data.get('industrial_addition')
-        if ia:
-            lines.append(f"\n【工业】")
-            lines.append(f"  工业增加值: {ia.get('yoy')}%, {ia.get('month')}")
-        
-        # 进出口
-        exp = data.get('exports')
-        imp = data.get('imports')
-        if exp and imp:
-            lines.append(f"\n【进出口】")
-            lines.append(f"  出口: {exp.get('value')}亿美元, 同比 {exp.get('yoy')}%")
-            lines.append(f"  进口: {imp.get('value')}亿美元, 同比 {imp.get('yoy')}%")
-            tb = data.get('trade_balance')
-            if tb:
-                lines.append(f"  贸易顺差: {tb.get('value')}亿美元")
+                block += f"\n  非制造业: {pmi_s.get('value')}"
+            sections.append(block)
         
-        # 央行
-        cb = data.get('central_bank', [])
-        if cb:
-            lines.append(f"\n【央行政策】")
-            for item in cb[:5]:
-                lines.append(f"  {item['name']}: {item['value']}")
+        # 消费、投资、工业、进出口、央行：数据仍是静态数据时直接复用预渲染文本
+        if all(data.get(k) is self.STATIC_DATA.get(k) for k in _STATIC_SECTION_KEYS):
+            sections.extend(self._STATIC_SECTION_BLOCKS)
+        else:
+            sections.extend(_render_static_sections(data))
         
         # 货币供应
         m2 = data.get('m2')
         if m2:
-            lines.append(f"\n【货币供应】")
-            lines.append(f"  M2: {m2.get('value')}万亿元, 同比 {m2.get('yoy')}%")
+            sections.append(f"\n【货币供应】\n  M2: {m2.get('value')}万亿元, 同比 {m2.get('yoy')}%")
         
         # 社融
         sf = data.get('social_financing')
         if sf:
-            lines.append(f"\n【社会融资】")
-            lines.append(f"  新增: {sf.get('value')}万亿元, 同比 {sf.get('yoy')}%")
+            sections.append(f"\n【社会融资】\n  新增: {sf.get('value')}万亿元, 同比 {sf.get('yoy')}%")
         
         # 房地产
         re = data.get('real_estate')
         if re:
-            lines.append(f"\n【房地产】")
-            lines.append(f"  投资: {re.get('investment_yoy')}%")
-            lines.append(f"  销售: {re.get('sales_yoy')}%")
+            sections.append(
+                f"\n【房地产】\n"
+                f"  投资: {re.get('investment_yoy')}%\n"
+                f"  销售: {re.get('sales_yoy')}%"
+            )
         
-        return "\n".join(lines)
+        return "\n".join(sections)
+
+
+def _save(data: MacroEconomyData, args) -> None:
+    """保存到文件"""
+    filepath = data.save_to_file(compact=args.compact)
+    print(f"✅ 数据已保存到: {filepath}")
+
+
+def _print_json(data: MacroEconomyData, args) -> None:
+    """输出完整JSON"""
+    print(dumps(data.get_all(), indent=not args.compact))
+
+
+def _print_db(data: MacroEconomyData, args) -> None:
+    """测试数据库读取"""
+    if HAS_DB:
+        db_data = data._load_from_database()
+        print("从数据库读取的数据:")
+        print(dumps(db_data))
+    else:
+        print("数据库模块未安装")
+
+
+def _print_summary(data: MacroEconomyData, args) -> None:
+    """输出摘要文本"""
+    print(data.get_summary())
+
+
+HANDLERS = {
+    'save': _save,
+    'json': _print_json,
+    'db': _print_db,
+    'summary': _print_summary,
+}
 
 
 def main():
-    import sys
-    import os
+    import argparse
     
-    data = MacroEconomyData()
+    parser = argparse.ArgumentParser(description='宏观经济数据')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--save', dest='mode', action='store_const', const='save', help='保存到JSON文件')
+    group.add_argument('--json', dest='mode', action='store_const', const='json', help='输出完整JSON')
+    group.add_argument('--db', dest='mode', action='store_const', const='db', help='测试数据库读取')
+    parser.add_argument('--compact', action='store_true', help='JSON 使用紧凑格式')
+    parser.set_defaults(mode='summary')
+    args = parser.parse_args()
     
-    if '--save' in sys.argv:
-        # 保存到文件
-        filepath = data.save_to_file()
-        print(f"✅ 数据已保存到: {filepath}")
-    elif len(sys.argv) > 1 and sys.argv[1] == '--json':
-        result = data.get_all()
-        print(json.dumps(result, ensure_ascii=False, indent=2))
-    elif len(sys.argv) > 1 and sys.argv[1] == '--db':
-        # 测试数据库读取
-        if HAS_DB:
-            db_data = data._load_from_database()
-            print("从数据库读取的数据:")
-            print(json.dumps(db_data, ensure_ascii=False, indent=2))
-        else:
-            print("数据库模块未安装")
-    else:
-        print(data.get_summary())
+    HANDLERS[args.mode](MacroEconomyData(), args)
 
 
 if __name__ == "__main__":
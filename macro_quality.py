@@ -4,22 +4,54 @@
 检查数据完整性、异常值、与历史数据对比
 """
 
-import json
 import os
+import statistics
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from utils.json_codec import dumps, loads
+
+
+@lru_cache(maxsize=64)
+def _load_json_cached(path: str, mtime_ns: int) -> Dict:
+    """按 (路径, 修改时间) 缓存解析结果，文件被改写后自动重新读取"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def _load_json(path: str) -> Dict:
+    """读取 JSON 文件（结果可能被缓存共享，调用方不得原地修改）"""
+    return _load_json_cached(path, os.stat(path).st_mtime_ns)
+
+
+def _score(issues: List[str], warnings: List[str], weights: Tuple[int, int]) -> int:
+    """按 (每个问题扣分, 每个警告扣分) 计算得分，限定在 0~100"""
+    issue_weight, warning_weight = weights
+    return max(0, min(100, 100 - len(issues) * issue_weight - len(warnings) * warning_weight))
+
+
+def _build_range_table(value_ranges: Dict, fields) -> Tuple:
+    """将范围配置展开为 (字段, 检查键, 下限, 上限, 单位) 元组，供逐项检查直接解包"""
+    return tuple(
+        (name, value_ranges[name].get('field', 'yoy'),
+         value_ranges[name]['min'], value_ranges[name]['max'], value_ranges[name]['unit'])
+        for name in fields
+    )
 
 
 class MacroDataQualityChecker:
     """宏观经济数据质量检查器"""
     
     # 期望的数据字段（必需）
-    REQUIRED_FIELDS = [
+    REQUIRED_FIELDS = (
         'gdp', 'cpi', 'ppi', 'pmi',
         'retail', 'fixed_investment',
         'industrial_addition', 'exports', 'imports',
         'central_bank', 'm2', 'real_estate'
-    ]
+    )
+    # 供成员判断使用
+    REQUIRED_FIELD_SET = frozenset(REQUIRED_FIELDS)
     
     # 数值字段的合理范围（用于异常检测）
     VALUE_RANGES = {
@@ -32,23 +64,82 @@ class MacroDataQualityChecker:
         'real_estate': {'min': -30, 'max': 10, 'unit': '%', 'field': 'investment_yoy'},
     }
     
+    # 各项检查的扣分权重: (每个问题, 每个警告)
+    COMPLETENESS_WEIGHTS = (20, 5)
+    RANGE_WEIGHTS = (15, 0)
+    HISTORY_WEIGHTS = (10, 0)
+    
+    # 参与范围检查的字段
+    RANGE_CHECK_FIELDS = ('gdp', 'cpi', 'ppi', 'pmi', 'm2', 'fixed_investment')
+    
+    # 类定义时展开一次的检查表
+    _RANGE_TABLE = _build_range_table(VALUE_RANGES, RANGE_CHECK_FIELDS)
+    
+    # 固定范围始终检查，越界记为问题；历史上出现过的不同取值不少于 MIN_HISTORY 个时，
+    # 另按 均值 ± ZSCORE_K 倍标准差 判断异常，仅记为警告（不扣分）
+    # 月度/季度指标在每日快照中重复出现，只统计不同取值；
+    # 标准差不低于固定范围宽度的 MIN_SIGMA_RATIO 倍，避免波动极小时误报
+    MIN_HISTORY = 5
+    ZSCORE_K = 3
+    MIN_SIGMA_RATIO = 0.1
+    
+    # 待检查的当日数据文件
+    TODAY_FILE = 'macro_formatted.json'
+    
     def __init__(self, data_dir: str = None):
         if data_dir is None:
             data_dir = os.path.join(os.path.dirname(__file__), 'data')
         self.data_dir = data_dir
+        # 目录扫描缓存: (目录 mtime_ns, 按日期倒序的文件名)，目录内容变化时失效
+        self._listing: Optional[Tuple[int, List[str]]] = None
     
-    def load_latest(self, days_back: int = 30) -> List[Dict]:
-        """加载最近N天的数据"""
-        files = []
-        if not os.path.exists(self.data_dir):
+    def _list_data_files(self) -> List[str]:
+        """列出数据目录中的 macro_*.json 文件，按日期倒序"""
+        try:
+            mtime_ns = os.stat(self.data_dir).st_mtime_ns
+        except OSError:
             return []
         
-        for f in os.listdir(self.data_dir):
-            if f.startswith('macro_') and f.endswith('.json'):
-                files.append(f)
+        if self._listing is not None and self._listing[0] == mtime_ns:
+            return self._listing[1]
         
+        with os.scandir(self.data_dir) as it:
+            files = [e.name for e in it if e.name.startswith('macro_') and e.name.endswith('.json')]
+        
+        # 文件名含 ISO 日期，字典序即时间顺序
         files.sort(reverse=True)
-        return files[:days_back]
+        self._listing = (mtime_ns, files)
+        return files
+    
+    def load_latest(self, days_back: int = 30) -> List[Dict]:
+        """加载最近N天的数据"""
+        return self._list_data_files()[:days_back]
+    
+    def _history_stats(self) -> Dict[str, Tuple[float, float]]:
+        """统计各检查字段历史不同取值的 (均值, 标准差)，取值不足的字段不返回"""
+        samples = {name: set() for name, *_ in self._RANGE_TABLE}
+        
+        for filename in self.load_latest():
+            if filename == self.TODAY_FILE:
+                continue
+            try:
+                fields = _load_json(os.path.join(self.data_dir, filename)).get('data', {})
+            except (OSError, ValueError):
+                continue
+            
+            for name, key, *_ in self._RANGE_TABLE:
+                field_data = fields.get(name)
+                value = field_data.get(key) if isinstance(field_data, dict) else None
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    samples[name].add(value)
+        
+        stats = {}
+        for name, _, lo, hi, _ in self._RANGE_TABLE:
+            values = samples[name]
+            if len(values) >= self.MIN_HISTORY:
+                sigma = max(statistics.pstdev(values), (hi - lo) * self.MIN_SIGMA_RATIO)
+                stats[name] = (statistics.fmean(values), sigma)
+        return stats
     
     def check_completeness(self, data: Dict) -> Dict:
         """检查数据完整性"""
@@ -61,9 +152,12 @@ class MacroDataQualityChecker:
         # Get the data dict - handle both formats
         fields = data.get('data', {})
         
-        # 检查必需字段
+        # 检查必需字段（同时统计已填充字段数）
+        filled = 0
         for field in self.REQUIRED_FIELDS:
-            if field not in fields or not fields[field]:
+            if fields.get(field):
+                filled += 1
+            else:
                 issues.append(f"缺失字段: {field}")
         
         # 检查嵌套字段
@@ -85,17 +179,12 @@ class MacroDataQualityChecker:
             if not cb or len(cb) < 3:
                 warnings.append("央行数据不足")
         
-        # 计算分数
-        base = 100
-        score = base - len(issues) * 20 - len(warnings) * 5
-        score = max(0, score)
-        
         return {
             'issues': issues,
             'warnings': warnings,
-            'score': score,
+            'score': _score(issues, warnings, self.COMPLETENESS_WEIGHTS),
             'total_fields': len(self.REQUIRED_FIELDS),
-            'filled_fields': len([f for f in self.REQUIRED_FIELDS if f in fields and fields[f]])
+            'filled_fields': filled
         }
     
     def check_value_ranges(self, data: Dict) -> Dict:
@@ -105,36 +194,25 @@ class MacroDataQualityChecker:
         
         fields = data.get('data', {})
         
-        # 检查各字段
-        check_fields = {
-            'gdp': fields.get('gdp', {}),
-            'cpi': fields.get('cpi', {}),
-            'ppi': fields.get('ppi', {}),
-            'pmi': fields.get('pmi', {}),
-            'm2': fields.get('m2', {}),
-            'fixed_investment': fields.get('fixed_investment', {}),
-        }
+        stats = self._history_stats()
         
-        for field_name, field_data in check_fields.items():
-            if not field_data:
+        for name, key, lo, hi, unit in self._RANGE_TABLE:
+            field_data = fields.get(name)
+            value = field_data.get(key) if field_data else None
+            if value is None:
                 continue
             
-            if field_name in self.VALUE_RANGES:
-                range_info = self.VALUE_RANGES[field_name]
-                check_field = range_info.get('field', 'yoy')
-                
-                # 检查对应字段
-                value = field_data.get(check_field)
-                if value is not None:
-                    if value < range_info['min'] or value > range_info['max']:
-                        issues.append(
-                            f"{field_name} {check_field}异常: {value}{range_info['unit']} (合理范围: {range_info['min']} ~ {range_info['max']})"
-                        )
-        
-        score = 100 - len(issues) * 15
-        score = max(0, score)
-        
-        return {'issues': issues, 'warnings': [], 'score': score}
+            if not lo <= value <= hi:
+                issues.append(f"{name} {key}异常: {value}{unit} (合理范围: {lo} ~ {hi})")
+            elif name in stats:
+                mu, sigma = stats[name]
+                if abs(value - mu) > self.ZSCORE_K * sigma:
+                    warnings.append(
+                        f"{name} {key}异常: {value}{unit} "
+                        f"(历史均值 {mu:.2f}{unit}, 偏离超过{self.ZSCORE_K}倍标准差 {sigma:.2f})"
+                    )
+        
+        return {'issues': issues, 'warnings': warnings, 'score': _score(issues, warnings, self.RANGE_WEIGHTS)}
     
     def compare_with_history(self, data: Dict, history_files: List[str]) -> Dict:
         """与历史数据对比"""
@@ -150,8 +228,7 @@ class MacroDataQualityChecker:
         try:
             # 对比上一条数据
             prev_file = history_files[0]
-            with open(os.path.join(self.data_dir, prev_file), 'r') as f:
-                prev_data = json.load(f).get('data', {})
+            prev_data = _load_json(os.path.join(self.data_dir, prev_file)).get('data', {})
             
             # 对比关键指标
             compare_fields = ['gdp', 'cpi', 'ppi', 'm2']
@@ -181,18 +258,14 @@ class MacroDataQualityChecker:
         except Exception as e:
             warnings.append(f"历史对比失败: {e}")
         
-        score = 100 - len(issues) * 10
-        score = max(0, score)
-        
-        return {'issues': issues, 'warnings': warnings, 'score': score}
+        return {'issues': issues, 'warnings': warnings, 'score': _score(issues, warnings, self.HISTORY_WEIGHTS)}
     
-    def check_all(self) -> Dict:
-        """执行所有检查"""
+    def check_all(self, date: str = None) -> Dict:
+        """执行所有检查，date 为报告日期，默认今天"""
         
         # 获取今天的数据
-        today = datetime.now().strftime("%Y-%m-%d")
-        today_file = f"macro_formatted.json"
-        today_path = os.path.join(self.data_dir, today_file)
+        today = date or datetime.now().strftime("%Y-%m-%d")
+        today_path = os.path.join(self.data_dir, self.TODAY_FILE)
         
         if not os.path.exists(today_path):
             return {
@@ -201,8 +274,7 @@ class MacroDataQualityChecker:
                 'message': '今日数据尚未生成，请先运行收集任务'
             }
         
-        with open(today_path, 'r') as f:
-            data = json.load(f)
+        data = _load_json(today_path)
         
         # 加载历史数据
         history_files = self.load_latest()
@@ -228,53 +300,50 @@ class MacroDataQualityChecker:
             'history': history,
             'issues': all_issues,
             'warnings': all_warnings,
-            'summary': self._generate_summary(total_score, all_issues, all_warnings)
+            'summary': self._generate_summary(total_score, all_issues, all_warnings, today)
         }
         
         return result
     
-    def _generate_summary(self, score: int, issues: List[str], warnings: List[str]) -> str:
+    def _generate_summary(self, score: int, issues: List[str], warnings: List[str], date: str) -> str:
         """生成摘要"""
         
-        lines = []
-        lines.append("📋 宏观经济数据质量报告")
-        lines.append("=" * 50)
-        lines.append(f"\n日期: {datetime.now().strftime('%Y-%m-%d')}")
-        lines.append(f"质量评分: {score}/100")
-        
         if score >= 90:
-            lines.append("状态: ✅ 优秀")
+            status = "✅ 优秀"
         elif score >= 70:
-            lines.append("状态: ✅ 合格")
+            status = "✅ 合格"
         elif score >= 50:
-            lines.append("状态: ⚠️ 一般")
+            status = "⚠️ 一般"
         else:
-            lines.append("状态: ❌ 需关注")
+            status = "❌ 需关注"
         
+        details = ""
         if issues:
-            lines.append("\n❌ 问题:")
-            for issue in issues[:5]:  # 最多显示5条
-                lines.append(f"  - {issue}")
-        
+            # 最多显示5条
+            details += "\n\n❌ 问题:\n" + "\n".join(f"  - {issue}" for issue in issues[:5])
         if warnings:
-            lines.append("\n⚠️ 警告:")
-            for warn in warnings[:5]:
-                lines.append(f"  - {warn}")
-        
+            details += "\n\n⚠️ 警告:\n" + "\n".join(f"  - {warn}" for warn in warnings[:5])
         if not issues and not warnings:
-            lines.append("\n✅ 数据质量良好，无异常")
-        
-        return "\n".join(lines)
+            details = "\n\n✅ 数据质量良好，无异常"
+        
+        return (
+            f"📋 宏观经济数据质量报告\n{'=' * 50}\n"
+            f"\n日期: {date}\n"
+            f"质量评分: {score}/100\n"
+            f"状态: {status}"
+            f"{details}"
+        )
 
 
 def main():
     import sys
     
+    date = datetime.now().strftime("%Y-%m-%d")
     checker = MacroDataQualityChecker()
-    result = checker.check_all()
+    result = checker.check_all(date=date)
     
     if len(sys.argv) > 1 and sys.argv[1] == '--json':
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        print(dumps(result))
     else:
         print(result['summary'])
 
@@ -52,7 +52,9 @@ def main():
     }
     
     logger = logging.getLogger('main')
-    logger.info(f"Starting data collection at {datetime.now()}")
+    # 整个采集过程使用同一时刻，避免跨零点时各步骤日期不一致
+    started_at = datetime.now()
+    logger.info("Starting data collection at %s", started_at)
     
     results = {}
     
@@ -70,11 +72,11 @@ def main():
                 indices = result.get('indices', [])
                 if indices:
                     count = db_writer.write_stock_indices(indices)
-                    logger.info(f"✓ Stock: {len(indices)} indices, {count} written to DB")
+                    logger.info("✓ Stock: %s indices, %s written to DB", len(indices), count)
                 else:
-                    logger.info(f"✓ Stock: {len(indices)} indices")
+                    logger.info("✓ Stock: %s indices", len(indices))
         except Exception as e:
-            logger.error(f"✗ Stock collection failed: {e}")
+            logger.error("✗ Stock collection failed: %s", e)
         
         # 2. 宏观经济
         try:
@@ -82,9 +84,9 @@ def main():
             result = collector.run()
             if result:
                 results['macro'] = result
-                logger.info(f"✓ Macro: {list(result.get('data', {}).keys())}")
+                logger.info("✓ Macro: %s", list(result.get('data', {}).keys()))
         except Exception as e:
-            logger.error(f"✗ Macro collection failed: {e}")
+            logger.error("✗ Macro collection failed: %s", e)
         
         # 3. 资金流
         try:
@@ -92,9 +94,9 @@ def main():
             result = collector.run()
             if result:
                 results['fund_flow'] = result
-                logger.info(f"✓ Fund flow: {list(result.get('data', {}).keys())}")
+                logger.info("✓ Fund flow: %s", list(result.get('data', {}).keys()))
         except Exception as e:
-            logger.error(f"✗ Fund flow collection failed: {e}")
+            logger.error("✗ Fund flow collection failed: %s", e)
         
         # 4. 基金
         try:
@@ -102,9 +104,9 @@ def main():
             result = collector.run()
             if result:
                 results['fund'] = result
-                logger.info(f"✓ Fund: {list(result.get('data', {}).keys())}")
+                logger.info("✓ Fund: %s", list(result.get('data', {}).keys()))
         except Exception as e:
-            logger.error(f"✗ Fund collection failed: {e}")
+            logger.error("✗ Fund collection failed: %s", e)
         
         # 5. 可转债
         try:
@@ -112,9 +114,9 @@ def main():
             result = collector.run()
             if result:
                 results['cb'] = result
-                logger.info(f"✓ Convertible bond: {len(result.get('data', []))} records")
+                logger.info("✓ Convertible bond: %s records", len(result.get('data', [])))
         except Exception as e:
-            logger.error(f"✗ Bond collection failed: {e}")
+            logger.error("✗ Bond collection failed: %s", e)
         
         # 6. 全球市场
         try:
@@ -122,9 +124,9 @@ def main():
             result = collector.run()
             if result:
                 results['global_market'] = result
-                logger.info(f"✓ Global market: {list(result.get('data', {}).keys())}")
+                logger.info("✓ Global market: %s", list(result.get('data', {}).keys()))
         except Exception as e:
-            logger.error(f"✗ Global market collection failed: {e}")
+            logger.error("✗ Global market collection failed: %s", e)
         
         # 7. 期货数据
         try:
@@ -133,9 +135,9 @@ def main():
             result = collector.fetch()
             if result:
                 results['futures'] = result
-                logger.info(f"✓ Futures: {list(result.get('data', {}).keys())}")
+                logger.info("✓ Futures: %s", list(result.get('data', {}).keys()))
         except Exception as e:
-            logger.error(f"✗ Futures collection failed: {e}")
+            logger.error("✗ Futures collection failed: %s", e)
         
         # 8. 货币供应量 M0/M1/M2 (TuShare Pro)
         try:
@@ -146,11 +148,11 @@ def main():
                 ms_list = result.get('data', {}).get('money_supply', [])
                 if ms_list:
                     count = db_writer.write_money_supply(ms_list)
-                    logger.info(f"✓ Money supply: {len(ms_list)} records, {count} written to DB")
+                    logger.info("✓ Money supply: %s records, %s written to DB", len(ms_list), count)
                 else:
-                    logger.info(f"✓ Money supply: {len(ms_list)} records")
+                    logger.info("✓ Money supply: %s records", len(ms_list))
         except Exception as e:
-            logger.error(f"✗ Money supply collection failed: {e}")
+            logger.error("✗ Money supply collection failed: %s", e)
         
         # 9. 社会融资规模 (TuShare Pro)
         try:
@@ -161,12 +163,12 @@ def main():
                 sf_list = result.get('data', {}).get('social_financing', [])
                 if sf_list:
                     count = db_writer.write_social_financing(sf_list)
-                    logger.info(f"✓ Social financing: {len(sf_list)} records, {count} written to DB")
+                    logger.info("✓ Social financing: %s records, %s written to DB", len(sf_list), count)
                 else:
-                    logger.info(f"✓ Social financing: {len(sf_list)} records")
+                    logger.info("✓ Social financing: %s records", len(sf_list))
 
         except Exception as e:
-            logger.error(f"✗ Social financing collection failed: {e}")
+            logger.error("✗ Social financing collection failed: %s", e)
         
         # 10. PMI采购经理人指数 (TuShare Pro)
         try:
@@ -176,9 +178,9 @@ def main():
             
             if not df.empty:
                 pmi_data = {
-                    'date': datetime.now().strftime('%Y-%m-%d'),
+                    'date': started_at.strftime('%Y-%m-%d'),
                     'type': 'pmi',
-                    'timestamp': datetime.now().isoformat(),
+                    'timestamp': started_at.isoformat(),
                     'source': 'TuShare Pro',
                     'data': df.to_dict('records')
                 }
@@ -187,13 +189,13 @@ def main():
                 pmi_list = df.to_dict('records')
                 if pmi_list:
                     count = db_writer.write_pmi(pmi_list)
-                    logger.info(f"✓ PMI: {len(df)} records, {count} written to DB")
+                    logger.info("✓ PMI: %s records, %s written to DB", len(df), count)
                 else:
-                    logger.info(f"✓ PMI: {len(df)} records")
+                    logger.info("✓ PMI: %s records", len(df))
         except Exception as e:
-            logger.error(f"✗ PMI collection failed: {e}")
+            logger.error("✗ PMI collection failed: %s", e)
     
-    logger.info(f"Data collection completed. Results: {list(results.keys())}")
+    logger.info("Data collection completed. Results: %s", list(results.keys()))
     return results
 
 
@@ -4,12 +4,22 @@
 从腾讯财经获取A股指数数据
 """
 
+import os
 import re
-import urllib.request
-import urllib.error
-from typing import Dict, List, Optional
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime
-import json
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 添加项目根目录
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from utils.json_codec import dumps
 
 
 # 指数代码映射
@@ -24,16 +34,53 @@ INDICES = [
     {'code': 'sz399006', 'name': '创业板指'},
 ]
 
+# 腾讯行情返回格式: v_sh000001="1~上证指数~000001~..."
+QUOTE_RE = re.compile(r'v_(sh|sz)([0-9]{6})="([^"]+)"')
+
+
+@dataclass
+class Quote:
+    """单个指数的行情"""
+    # 兼容 Python 3.8，手动声明 __slots__ 而非 dataclass(slots=True)
+    __slots__ = ('code', 'name', 'price', 'prev_close', 'open', 'high', 'low',
+                 'volume', 'amount', 'change', 'change_percent')
+    
+    code: str
+    name: str
+    price: float
+    prev_close: float
+    open: float
+    high: float
+    low: float
+    volume: int
+    amount: float
+    change: float
+    change_percent: float
+    
+    def to_dict(self) -> Dict:
+        """转为字典（用于 JSON 输出和存储）"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
 
 class MarketCollector:
     """行情数据收集器"""
     
     BASE_URL = "https://qt.gtimg.cn/q="
     
+    # 单次请求的代码数上限（控制URL长度），超出时分片并发请求
+    SHARD_SIZE = 50
+    MAX_WORKERS = 4
+    
     def __init__(self):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        # 复用连接（keep-alive），重复或分片请求不再重新握手
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=self.MAX_WORKERS, pool_maxsize=self.MAX_WORKERS * 2)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
     
     def fetch(self, codes: List[str] = None) -> List[Dict]:
         """
@@ -43,32 +90,50 @@ class MarketCollector:
             codes: 指数代码列表，默认获取所有
         
         Returns:
-            行情数据列表
+            行情数据列表（字典）
         """
         if codes is None:
             codes = [idx['code'] for idx in INDICES]
         
+        # 一个请求即可返回多个代码，代码较少时不必分片
+        if len(codes) <= self.SHARD_SIZE:
+            return [quote.to_dict() for quote in self._fetch_shard(codes)]
+        
+        shards = [codes[i:i + self.SHARD_SIZE] for i in range(0, len(codes), self.SHARD_SIZE)]
+        results = []
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(shards))) as executor:
+            for shard_result in executor.map(self._fetch_shard, shards):
+                results.extend(quote.to_dict() for quote in shard_result)
+        return results
+    
+    def _fetch_shard(self, codes: List[str]) -> List[Quote]:
+        """请求一组代码的行情，失败时返回空列表"""
         # 构建URL
         codes_str = ','.join(codes)
         url = f"{self.BASE_URL}{codes_str}"
         
         # 请求
-        req = urllib.request.Request(url, headers=self.headers)
-        
         try:
-            with urllib.request.urlopen(req, timeout=15) as response:
-                content = response.read()
-                # GB18030转UTF-8
-                content = content.decode('GB18030', errors='ignore')
-                return self._parse(content)
-        except urllib.error.URLError as e:
+            with self._session.get(url, timeout=15, stream=True) as response:
+                response.raise_for_status()
+                # 每条记录独占一行，边读边解析，不缓存整个响应
+                return self._parse_lines(response.iter_lines())
+        except requests.RequestException as e:
             print(f"获取行情数据失败: {e}")
             return []
     
-    def _parse(self, content: str) -> List[Dict]:
-        """解析返回数据"""
+    def _parse_lines(self, lines: Iterable[bytes]) -> List[Quote]:
+        """逐行解析原始响应（GB18030 编码，每行一条记录）"""
         results = []
-        
+        for raw in lines:
+            for match in QUOTE_RE.finditer(raw.decode('GB18030', errors='ignore')):
+                quote = self._parse_match(match)
+                if quote is not None:
+                    results.append(quote)
+        return results
+    
+    def _parse_match(self, match: re.Match) -> Optional[Quote]:
+        """解析单条记录，字段不足时返回None"""
         # 格式: v_sh000001="1~上证指数~000001~4146.63~4147.23~4151.07~651702826~0~0~...~-0.60~-0.01~4152.19~4127.15~..."
         # 字段位置:
         # parts[3] = 当前价, parts[4] = 昨收, parts[5] = 今开
@@ -76,38 +141,37 @@ class MarketCollector:
         # parts[31] = 涨跌额, parts[32] = 涨跌幅
         # parts[33] = 最高, parts[34] = 最低
         # parts[37] = 成交额(元)
-        pattern = r'v_(sh|sz)(\w+)="([^"]+)"'
-        matches = re.findall(pattern, content)
+        prefix, code, data = match.groups()
+        full_code = f"{prefix}{code}"
+        # 只用到前38个字段，限定切分次数，不为后面的字段创建字符串
+        parts = data.split('~', 38)
         
-        for prefix, code, data in matches:
-            full_code = f"{prefix}{code}"
-            parts = data.split('~')
-            
-            if len(parts) < 38:
-                continue
-            
-            try:
-                result = {
-                    'code': full_code,
-                    'name': parts[1],
-                    'price': self._safe_float(parts[3]),
-                    'prev_close': self._safe_float(parts[4]),
-                    'open': self._safe_float(parts[5]),
-                    'high': self._safe_float(parts[33]),
-                    'low': self._safe_float(parts[34]),
-                    'volume': self._safe_int(parts[6]),
-                    'amount': self._safe_float(parts[37]),
-                    'change': self._safe_float(parts[31]),
-                    'change_percent': self._safe_float(parts[32]),
-                }
-                
-                results.append(result)
-                
-            except (ValueError, IndexError) as e:
-                print(f"解析数据失败 {full_code}: {e}")
-                continue
+        if len(parts) < 38:
+            return None
         
-        return results
+        try:
+            # 快速路径：字段均为合法数字时直接用内置类型转换
+            return self._build_quote(full_code, parts, float, int)
+        except ValueError:
+            # 个别字段不是数字（如 '-'）时逐项安全转换，无法解析的记为0
+            return self._build_quote(full_code, parts, self._safe_float, self._safe_int)
+    
+    @staticmethod
+    def _build_quote(code: str, parts: List[str], to_float, to_int) -> Quote:
+        """按字段位置组装行情，空字段记为0"""
+        return Quote(
+            code=code,
+            name=parts[1],
+            price=to_float(parts[3] or 0),
+            prev_close=to_float(parts[4] or 0),
+            open=to_float(parts[5] or 0),
+            high=to_float(parts[33] or 0),
+            low=to_float(parts[34] or 0),
+            volume=to_int(parts[6] or 0),
+            amount=to_float(parts[37] or 0),
+            change=to_float(parts[31] or 0),
+            change_percent=to_float(parts[32] or 0),
+        )
     
     def _safe_float(self, s: str) -> float:
         """安全转换为浮点数"""
@@ -123,33 +187,37 @@ class MarketCollector:
         except:
             return 0
     
-    def collect_all(self) -> Dict:
+    def collect_all(self, date: str = None) -> Dict:
         """
         收集所有指数数据
         
+        Args:
+            date: 数据日期，默认今天（由调用方统一传入，避免跨零点时各步骤日期不一致）
+        
         Returns:
             完整数据字典
         """
         data = self.fetch()
+        now = datetime.now()
         
         return {
-            'date': datetime.now().strftime("%Y-%m-%d"),
+            'date': date or now.strftime("%Y-%m-%d"),
             'type': 'indices',
             'count': len(data),
             'data': data,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now.isoformat()
         }
 
 
 def main():
     """命令行入口"""
-    import sys
-    
+    # 开始采集前确定日期，采集跨零点时仍记为启动当天
+    date = datetime.now().strftime("%Y-%m-%d")
     collector = MarketCollector()
-    result = collector.collect_all()
+    result = collector.collect_all(date=date)
     
     if len(sys.argv) > 1 and sys.argv[1] == '--json':
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        print(dumps(result))
     else:
         print(f"📊 行情数据 ({result['count']}个指数)")
         print("-" * 50)
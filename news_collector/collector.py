@@ -6,265 +6,371 @@
 
 import re
 import json
-from typing import Dict, List
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Dict, FrozenSet, Iterator, List, Tuple
 from datetime import datetime
-import urllib.request
 import urllib.parse
 
+import requests
+from requests.adapters import HTTPAdapter
+
+# 尝试导入 Aho-Corasick 多模式匹配
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# 各新闻源的标题/链接提取规则，模块加载时编译一次
+# 量词均限定字符类和长度上限，不跨越引号/标签边界，不匹配时可快速放弃
+SINA_RE = re.compile(r'<a href="(https?://[^"\s]{1,200})"[^>]{0,300}>([^<]{1,200})</a>')
+PHOENIX_RE = re.compile(r'<a\s+href="(https?://[^"\s]{1,200})"[^>]{0,300}?title="([^"]{1,120})"')
+EASTMONEY_RE = re.compile(r'title="([^"]{1,120})"')
+WALLSTREETCN_RES = (
+    re.compile(r'<a[^>]{0,300}href="/news/([^"]{1,200})"[^>]{0,300}>([^<]{1,120})</a>'),
+    re.compile(r'"title":"([^"]{1,120})"'),
+)
+
+
+def _sina_links(content: str) -> Iterator[Tuple[str, str]]:
+    """按页面顺序产出新浪搜索结果中的 (链接, 标题)"""
+    for match in SINA_RE.finditer(content):
+        yield match.group(1), match.group(2)
+
+
+def _phoenix_links(content: str) -> Iterator[Tuple[str, str]]:
+    """按页面顺序产出凤凰网带 title 属性的 (链接, 标题)"""
+    for match in PHOENIX_RE.finditer(content):
+        yield match.group(1), match.group(2)
+
+
+# 新闻分类关键词，按优先级排列，命中多个分类时取靠前的
+CATEGORY_KEYWORDS = (
+    ('宏观政策', ('降息', '降准', '加息', '通胀', 'gdp', '经济', '政策', '央行', '财政部', '证监会', '货币')),
+    ('国际市场', ('美股', '港股', '美联储', '欧洲', '日本', '韩国', '关税', '贸易', '特朗普', '拜登')),
+    ('公司重大事项', ('涨停', '跌停', '并购', '重组', '上市', 'ipo', '财报', '业绩', '分红', 'a股', '股市', '大盘', '指数')),
+    ('行业动态', ('新能源', '半导体', '医药', '银行', '地产', '汽车', '科技', 'ai', '人工智能', '芯片', '光伏')),
+)
+
+# 高重要性关键词
+HIGH_IMPORTANCE_KEYWORDS = ('央行', '降息', '降准', '加息', '关税', '重大', '涨停', '跌停',
+                            '突发', '重磅', '利好', '利空', '政策', '监管', '证监会', '美股',
+                            '崩盘', '暴涨', '大跌', '突破', '历史')
+
+HIGH_IMPORTANCE = '高'
+
+
+def _build_keyword_matcher() -> Callable[[str], FrozenSet[str]]:
+    """
+    构建关键词匹配函数：一次扫描文本，返回命中的全部标签（分类名及 HIGH_IMPORTANCE）
+    优先使用 Aho-Corasick 自动机，未安装时回退到预编译的多选正则
+    """
+    labels: Dict[str, set] = {}
+    for label, keywords in CATEGORY_KEYWORDS:
+        for kw in keywords:
+            labels.setdefault(kw, set()).add(label)
+    for kw in HIGH_IMPORTANCE_KEYWORDS:
+        labels.setdefault(kw, set()).add(HIGH_IMPORTANCE)
+
+    if HAS_AHOCORASICK:
+        automaton = ahocorasick.Automaton()
+        for kw, kw_labels in labels.items():
+            automaton.add_word(kw, frozenset(kw_labels))
+        automaton.make_automaton()
+
+        def match(text: str) -> FrozenSet[str]:
+            hits = set()
+            for _, kw_labels in automaton.iter(text):
+                hits |= kw_labels
+            return frozenset(hits)
+
+        return match
+
+    # 零宽先行断言逐位置匹配（可重叠），同一位置优先最长关键词；
+    # 作为前缀同时命中的较短关键词，其标签并入较长关键词
+    merged = {
+        kw: frozenset().union(*(kw_labels for prefix, kw_labels in labels.items() if kw.startswith(prefix)))
+        for kw in labels
+    }
+    pattern = re.compile('(?=(%s))' % '|'.join(
+        re.escape(kw) for kw in sorted(labels, key=len, reverse=True)))
+
+    def match(text: str) -> FrozenSet[str]:
+        hits = set()
+        for m in pattern.finditer(text):
+            hits |= merged[m.group(1)]
+        return frozenset(hits)
+
+    return match
+
+
+_match_keywords = _build_keyword_matcher()
+
+
+@lru_cache(maxsize=256)
+def _keyword_hits(text: str) -> FrozenSet[str]:
+    """文本命中的标签；分类与重要性判断先后处理同一标题，第二次直接命中缓存"""
+    return _match_keywords(text)
+
 
 class NewsCollector:
     """新闻数据收集器"""
     
+    # 连接池参数：缓存的主机连接池数、每个主机保持的最大连接数
+    POOL_CONNECTIONS = 8
+    POOL_MAXSIZE = 4
+    
+    # 每个页面最多读取的字节数（解压后），只防止异常大的响应；
+    # 目前各源的列表页均远小于此值，触发截断时会打印提示，页面后部的链接可能缺失
+    MAX_PAGE_BYTES = 1024 * 1024
+    
     def __init__(self):
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            # 页面按压缩格式传输，由 urllib3 自动解压
+            'Accept-Encoding': 'gzip, deflate',
         }
         self.sources = []
+        
+        # 共享连接池：各源分属不同主机，每个主机保持长连接，避免重复TCP/TLS握手
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=self.POOL_CONNECTIONS, pool_maxsize=self.POOL_MAXSIZE)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+    
+    def _get_text(self, url: str) -> str:
+        """通过共享会话请求页面，返回前 MAX_PAGE_BYTES 字节解码后的文本"""
+        with self._session.get(url, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= self.MAX_PAGE_BYTES:
+                    print(f"页面超过 {self.MAX_PAGE_BYTES} 字节，已截断: {url}")
+                    break
+        
+        # 截断处可能落在多字节字符中间，忽略不完整的字符
+        return b''.join(chunks)[:self.MAX_PAGE_BYTES].decode('utf-8', errors='ignore')
     
-    def fetch_from_sina(self) -> List[Dict]:
+    def fetch_from_sina(self, ts: str = None) -> List[Dict]:
         """从新浪财经获取新闻"""
         results = []
+        ts = ts or datetime.now().isoformat()
         
         try:
             encoded_keyword = urllib.parse.quote('A股')
             url = f"https://search.sina.com.cn/?q={encoded_keyword}&c=news&sort=time"
             
-            req = urllib.request.Request(url, headers=self.headers)
+            content = self._get_text(url)
             
-            with urllib.request.urlopen(req, timeout=10) as response:
-                content = response.read().decode('utf-8', errors='ignore')
-                
-                # 提取标题和链接
-                pattern = r'<a href="(https?://[^"]+)"[^>]*>([^<]+)</a>'
-                matches = re.findall(pattern, content)
-                
-                seen = set()
-                for url, title in matches[:15]:
-                    if title.strip() and len(title) > 10 and url not in seen:
-                        if 'sina.com.cn' in url or 'finance.sina' in url:
-                            seen.add(url)
-                            category = self._classify_news(title, '')
-                            results.append({
-                                'title': title.strip()[:100],
-                                'url': url,
-                                'source': '新浪财经',
-                                'category': category,
-                                'importance': self._get_importance(title, ''),
-                                'timestamp': datetime.now().isoformat(),
-                                'summary': '',
-                            })
-                            
+            # 提取标题和链接
+            seen = set()
+            for url, title in islice(_sina_links(content), 15):
+                if title.strip() and len(title) > 10 and url not in seen:
+                    if 'sina.com.cn' in url or 'finance.sina' in url:
+                        seen.add(url)
+                        text_lower = title.lower()
+                        category = self._classify_news(text_lower)
+                        results.append({
+                            'title': title.strip()[:100],
+                            'url': url,
+                            'source': '新浪财经',
+                            'category': category,
+                            'importance': self._get_importance(text_lower),
+                            'timestamp': ts,
+                            'summary': '',
+                        })
+                        
         except Exception as e:
             print(f"新浪财经获取失败: {e}")
         
         return results
     
-    def fetch_from_phoenix(self) -> List[Dict]:
+    def fetch_from_phoenix(self, ts: str = None) -> List[Dict]:
         """从凤凰财经获取新闻"""
         results = []
+        ts = ts or datetime.now().isoformat()
         
         try:
             # 凤凰网财经频道
             url = "https://news.ifeng.com/"
             
-            req = urllib.request.Request(url, headers=self.headers)
+            content = self._get_text(url)
             
-            with urllib.request.urlopen(req, timeout=10) as response:
-                content = response.read().decode('utf-8', errors='ignore')
-                
-                # 提取财经相关新闻
-                pattern = r'<a href="(https?://[^\s]+)"[^>]*title="([^"]+)"[^>]*>'
-                matches = re.findall(pattern, content)
-                
-                seen = set()
-                for url, title in matches[:20]:
-                    title = title.strip()
-                    # 过滤：长度合适、是财经相关内容
-                    if (title and len(title) >= 10 and len(title) <= 80 and 
-                        url not in seen and 'ifeng.com' in url):
+            # 提取财经相关新闻
+            seen = set()
+            for url, title in islice(_phoenix_links(content), 20):
+                title = title.strip()
+                # 过滤：长度合适、是财经相关内容
+                if (title and len(title) >= 10 and len(title) <= 80 and 
+                    url not in seen and 'ifeng.com' in url):
+                    
+                    # 过滤无关链接
+                    if any(x in url for x in ['finance', 'stock', 'money', 'biz', 'news']):
+                        seen.add(url)
+                        text_lower = title.lower()
+                        category = self._classify_news(text_lower)
+                        results.append({
+                            'title': title[:100],
+                            'url': url,
+                            'source': '凤凰财经',
+                            'category': category,
+                            'importance': self._get_importance(text_lower),
+                            'timestamp': ts,
+                            'summary': '',
+                        })
                         
-                        # 过滤无关链接
-                        if any(x in url for x in ['finance', 'stock', 'money', 'biz', 'news']):
-                            seen.add(url)
-                            category = self._classify_news(title, '')
-                            results.append({
-                                'title': title[:100],
-                                'url': url,
-                                'source': '凤凰财经',
-                                'category': category,
-                                'importance': self._get_importance(title, ''),
-                                'timestamp': datetime.now().isoformat(),
-                                'summary': '',
-                            })
-                            
         except Exception as e:
             print(f"凤凰财经获取失败: {e}")
         
         return results
     
-    def fetch_from_eastmoney(self) -> List[Dict]:
+    def fetch_from_eastmoney(self, ts: str = None) -> List[Dict]:
         """从东方财富获取新闻"""
         results = []
+        ts = ts or datetime.now().isoformat()
         
         try:
             url = "https://stock.eastmoney.com/"
             
-            req = urllib.request.Request(url, headers=self.headers)
+            content = self._get_text(url)
             
-            with urllib.request.urlopen(req, timeout=10) as response:
-                content = response.read().decode('utf-8', errors='ignore')
-                
-                # 提取新闻标题
-                pattern = r'title="([^"]+)"'
-                matches = re.findall(pattern, content)
-                
-                seen = set()
-                for title in matches:
-                    title = title.strip()
-                    # 过滤：长度合适、是财经相关内容
-                    if (title and 10 <= len(title) <= 60 and title not in seen):
+            # 提取新闻标题
+            seen = set()
+            for match in EASTMONEY_RE.finditer(content):
+                title = match.group(1)
+                title = title.strip()
+                # 过滤：长度合适、是财经相关内容
+                if (title and 10 <= len(title) <= 60 and title not in seen):
+                    
+                    # 过滤无关标题
+                    if any(x in title for x in ['股', '板块', '涨停', '跌停', '指数', '期货', '宏观', '政策', '财报', '业绩', 'A股', '美股', '港股']):
+                        seen.add(title)
+                        text_lower = title.lower()
+                        category = self._classify_news(text_lower)
+                        results.append({
+                            'title': title[:100],
+                            'url': "https://stock.eastmoney.com/",
+                            'source': '东方财富',
+                            'category': category,
+                            'importance': self._get_importance(text_lower),
+                            'timestamp': ts,
+                            'summary': '',
+                        })
                         
-                        # 过滤无关标题
-                        if any(x in title for x in ['股', '板块', '涨停', '跌停', '指数', '期货', '宏观', '政策', '财报', '业绩', 'A股', '美股', '港股']):
-                            seen.add(title)
-                            category = self._classify_news(title, '')
-                            results.append({
-                                'title': title[:100],
-                                'url': "https://stock.eastmoney.com/",
-                                'source': '东方财富',
-                                'category': category,
-                                'importance': self._get_importance(title, ''),
-                                'timestamp': datetime.now().isoformat(),
-                                'summary': '',
-                            })
-                            
         except Exception as e:
             print(f"东方财富获取失败: {e}")
         
         return results
     
-    def fetch_from_wallstreetcn(self) -> List[Dict]:
+    def fetch_from_wallstreetcn(self, ts: str = None) -> List[Dict]:
         """从华尔街见闻获取新闻（需要认证，仅尝试）"""
         results = []
+        ts = ts or datetime.now().isoformat()
         
         try:
             # 尝试RSS或公开API
             url = "https://www.wallstreetcn.com/news"
             
-            req = urllib.request.Request(url, headers=self.headers)
+            content = self._get_text(url)
             
-            with urllib.request.urlopen(req, timeout=10) as response:
-                content = response.read().decode('utf-8', errors='ignore')
+            # 尝试提取新闻标题（每个规则只取第一个匹配）
+            for pattern in WALLSTREETCN_RES:
+                match = pattern.search(content)
+                if match is None:
+                    continue
                 
-                # 尝试提取新闻标题
-                patterns = [
-                    r'<a[^>]*href="/news/([^"]+)"[^>]*>([^<]+)</a>',
-                    r'"title":"([^"]+)"',
-                ]
+                if pattern.groups > 1:
+                    slug, title = match.group(1), match.group(2)
+                else:
+                    slug, title = '', match.group(1)
                 
-                for pattern in patterns:
-                    matches = re.findall(pattern, content)
-                    for match in matches[:10]:
-                        if isinstance(match, tuple):
-                            title = match[1] if len(match) > 1 else match[0]
-                        else:
-                            title = match
+                title = title.strip()
+                if title and 10 <= len(title) <= 80:
+                    text_lower = title.lower()
+                    results.append({
+                        'title': title[:100],
+                        'url': f"https://www.wallstreetcn.com/news/{slug}",
+                        'source': '华尔街见闻',
+                        'category': self._classify_news(text_lower),
+                        'importance': self._get_importance(text_lower),
+                        'timestamp': ts,
+                        'summary': '',
+                    })
                         
-                        title = title.strip()
-                        if title and 10 <= len(title) <= 80:
-                            results.append({
-                                'title': title[:100],
-                                'url': f"https://www.wallstreetcn.com/news/{match[0] if isinstance(match, tuple) else ''}",
-                                'source': '华尔街见闻',
-                                'category': self._classify_news(title, ''),
-                                'importance': self._get_importance(title, ''),
-                                'timestamp': datetime.now().isoformat(),
-                                'summary': '',
-                            })
-                        break
-                            
         except Exception as e:
             print(f"华尔街见闻获取失败: {e}")
         
         return results
     
     def fetch_all(self) -> List[Dict]:
-        """从所有源获取新闻"""
-        all_news = []
+        """从所有源获取新闻（各源并发请求，总耗时约为最慢一个源的耗时）"""
+        fetchers = (
+            ('新浪财经', self.fetch_from_sina),
+            ('凤凰财经', self.fetch_from_phoenix),
+            ('东方财富', self.fetch_from_eastmoney),
+            ('华尔街见闻', self.fetch_from_wallstreetcn),  # 可能失败
+        )
         
-        # 新浪财经
-        sina_news = self.fetch_from_sina()
-        all_news.extend(sina_news)
-        print(f"新浪财经: {len(sina_news)}条")
+        # 同一批次的新闻共用一个采集时间戳
+        ts = datetime.now().isoformat()
         
-        # 凤凰财经
-        phoenix_news = self.fetch_from_phoenix()
-        all_news.extend(phoenix_news)
-        print(f"凤凰财经: {len(phoenix_news)}条")
-        
-        # 东方财富
-        eastmoney_news = self.fetch_from_eastmoney()
-        all_news.extend(eastmoney_news)
-        print(f"东方财富: {len(eastmoney_news)}条")
-        
-        # 华尔街见闻 (可能失败)
-        try:
-            wsnews = self.fetch_from_wallstreetcn()
-            all_news.extend(wsnews)
-            print(f"华尔街见闻: {len(wsnews)}条")
-        except:
-            pass
-        
-        # 去重 (使用URL和标题组合)
         seen = set()
         unique_results = []
-        for news in all_news:
-            # 使用URL+标题作为唯一标识
-            key = (news['url'], news['title'][:30])
-            if key not in seen:
-                seen.add(key)
-                unique_results.append(news)
+        
+        with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+            futures = [(name, executor.submit(fetch, ts)) for name, fetch in fetchers]
+            
+            # 按源的固定顺序边汇总边去重（URL+标题前30字），保持结果与串行时一致
+            for name, future in futures:
+                try:
+                    news = future.result()
+                except Exception:
+                    continue
+                print(f"{name}: {len(news)}条")
+                
+                for item in news:
+                    key = (item['url'], item['title'][:30])
+                    if key not in seen:
+                        seen.add(key)
+                        unique_results.append(item)
         
         return unique_results[:20]
     
-    def _classify_news(self, title: str, content: str) -> str:
-        """分类新闻"""
-        text = (title + content).lower()
+    def _classify_news(self, text_lower: str) -> str:
+        """分类新闻（text_lower 为已转小写的标题+正文）"""
+        hits = _keyword_hits(text_lower)
         
-        if any(kw in text for kw in ['降息', '降准', '加息', '通胀', 'gdp', '经济', '政策', '央行', '财政部', '证监会', '货币']):
-            return '宏观政策'
-        elif any(kw in text for kw in ['美股', '港股', '美联储', '欧洲', '日本', '韩国', '关税', '贸易', '特朗普', '拜登']):
-            return '国际市场'
-        elif any(kw in text for kw in ['涨停', '跌停', '并购', '重组', '上市', 'ipo', '财报', '业绩', '分红', 'a股', '股市', '大盘', '指数']):
-            return '公司重大事项'
-        elif any(kw in text for kw in ['新能源', '半导体', '医药', '银行', '地产', '汽车', '科技', 'ai', '人工智能', '芯片', '光伏']):
-            return '行业动态'
-        else:
-            return '其他'
+        for label, _ in CATEGORY_KEYWORDS:
+            if label in hits:
+                return label
+        return '其他'
     
-    def _get_importance(self, title: str, content: str) -> str:
-        """判断重要性"""
-        text = (title + content).lower()
-        
-        high_importance = ['央行', '降息', '降准', '加息', '关税', '重大', '涨停', '跌停', 
-                          '突发', '重磅', '利好', '利空', '政策', '监管', '证监会', '美股',
-                          '崩盘', '暴涨', '大跌', '突破', '历史']
-        
-        if any(kw in text for kw in high_importance):
-            return '高'
+    def _get_importance(self, text_lower: str) -> str:
+        """判断重要性（text_lower 为已转小写的标题+正文）"""
+        if HIGH_IMPORTANCE in _keyword_hits(text_lower):
+            return HIGH_IMPORTANCE
         return '中'
     
-    def collect_all(self) -> Dict:
-        """收集所有新闻"""
+    def collect_all(self, date: str = None) -> Dict:
+        """收集所有新闻，date 默认今天"""
         data = self.fetch_all()
+        now = datetime.now()
         
         return {
-            'date': datetime.now().strftime("%Y-%m-%d"),
+            'date': date or now.strftime("%Y-%m-%d"),
             'type': 'news',
             'sources': ['新浪财经', '凤凰财经', '华尔街见闻'],
             'count': len(data),
             'data': data,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now.isoformat()
         }
 
 
@@ -272,8 +378,10 @@ def main():
     """命令行入口"""
     import sys
     
+    # 开始采集前确定日期，采集跨零点时仍记为启动当天
+    date = datetime.now().strftime("%Y-%m-%d")
     collector = NewsCollector()
-    result = collector.collect_all()
+    result = collector.collect_all(date=date)
     
     if len(sys.argv) > 1 and sys.argv[1] == '--json':
         print(json.dumps(result, ensure_ascii=False, indent=2))
@@ -282,20 +390,12 @@ def main():
         print("-" * 50)
         
         # 按来源统计
-        sources_count = {}
-        for item in result['data']:
-            src = item['source']
-            sources_count[src] = sources_count.get(src, 0) + 1
-        
-        print(f"来源: {sources_count}")
+        sources_count = Counter(item['source'] for item in result['data'])
+        print(f"来源: {dict(sources_count)}")
         
         # 按分类统计
-        categories = {}
-        for item in result['data']:
-            cat = item['category']
-            categories[cat] = categories.get(cat, 0) + 1
-        
-        print(f"分类: {categories}")
+        categories = Counter(item['category'] for item in result['data'])
+        print(f"分类: {dict(categories)}")
         
         print("-" * 50)
         print("\n重要新闻:")
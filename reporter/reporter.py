@@ -9,6 +9,119 @@ from datetime import datetime
 import json
 
 
+# 报告模板：固定文本一次成型，只有表格行、新闻列表等动态部分单独拼接
+# 各片段内每行均以换行结尾，片段之间直接相连
+_REPORT_TMPL = """\
+# 📈 市场每日简报
+**日期**: {date}
+
+---
+
+{market}{news}{conclusion}
+---
+
+*本报告由 AI 自动生成*"""
+
+_MARKET_TMPL = """\
+## 一、行情分析
+
+### 1.1 涨跌幅排行
+
+| 指数 | 收盘价 | 涨跌幅 | 成交额(亿) |
+|:-----|-------:|-------:|----------:|
+{change_rows}
+### 1.2 成交量分析
+
+{volume}
+{basis}"""
+
+_VOLUME_TMPL = """\
+**今日总成交额(沪市+深市)**: {total:.1f}亿元
+
+| 指标 | 数值 |
+|:-----|------:|
+| 成交额 | {total:.1f}亿 |
+| 日均成交额(近{days}日) | {avg:.1f}亿 |
+| 最高成交额 | {max_name}: {max_value:.1f}亿 |
+| 最低成交额 | {min_name}: {min_value:.1f}亿 |
+
+**趋势判断**: {trend}
+**解读**: {interpretation}
+"""
+
+_BASIS_TMPL = """\
+### 1.3 基差分析
+
+| 指数 | 合约 | 期货价 | 现货价 | 基差 | 年化基差率 |
+|------|------|--------|--------|------|------------|
+{rows}
+> 交易日计算说明：距到期日 {trading_days} 个交易日
+
+"""
+
+_NEWS_TMPL = """\
+---
+
+## 二、新闻分析
+
+### 2.1 新闻概况
+
+- 总数: {count} 条
+- 市场情绪: **{sentiment}**
+
+### 2.2 今日新闻标题
+
+{items}
+"""
+
+_CONCLUSION_TMPL = """\
+---
+
+## 三、综合结论
+
+### 3.1 市场判断
+
+{market_view}
+
+### 3.2 风险提示
+
+{risk_alerts}
+### 3.3 投资建议
+
+{recommendations}
+"""
+
+_FEISHU_RULE = "━━━━━━━━━━━━━━━━━━━━"
+
+_FEISHU_TMPL = """\
+📈 市场每日简报 {date}
+
+{rule}
+
+## 一、行情分析
+
+### 涨跌幅排行
+
+{change_rows}
+{basis}
+{rule}
+
+## 二、新闻分析
+
+总数: {count}条 | 市场情绪: {sentiment}
+
+{news_rows}
+{rule}
+
+## 三、综合结论
+
+判断: {market_view}
+{recommendations}
+{rule}
+
+🤖 本报告由 AI 自动生成"""
+
+
 class Reporter:
     """报告生成器"""
     
@@ -25,50 +138,23 @@ class Reporter:
         Returns:
             Markdown格式报告
         """
-        date = analysis.get('date', datetime.now().strftime("%Y-%m-%d"))
-        
-        lines = []
-        
-        # 标题
-        lines.append("# 📈 市场每日简报")
-        lines.append(f"**日期**: {date}")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-        
-        # 一、行情分析
-        lines.extend(self._generate_market_section(analysis.get('market', {}), analysis.get('basis', [])))
-        
-        # 二、新闻分析
-        lines.extend(self._generate_news_section(analysis.get('news', {})))
-        
-        # 三、综合结论
-        lines.extend(self._generate_conclusion_section(analysis.get('conclusion', {})))
-        
-        # 结尾
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-        lines.append("*本报告由 AI 自动生成*")
-        
-        return "\n".join(lines)
+        return _REPORT_TMPL.format(
+            date=analysis.get('date', datetime.now().strftime("%Y-%m-%d")),
+            # 一、行情分析
+            market=self._generate_market_section(analysis.get('market', {}), analysis.get('basis', [])),
+            # 二、新闻分析
+            news=self._generate_news_section(analysis.get('news', {})),
+            # 三、综合结论
+            conclusion=self._generate_conclusion_section(analysis.get('conclusion', {})),
+        )
     
-    def _generate_market_section(self, market: Dict, basis: List[Dict] = None) -> List[str]:
+    def _generate_market_section(self, market: Dict, basis: List[Dict] = None) -> str:
         """生成行情分析部分"""
         if basis is None:
             basis = []
         
-        lines = []
-        
-        lines.append("## 一、行情分析")
-        lines.append("")
-        
         # 1.1 涨跌幅排行
-        lines.append("### 1.1 涨跌幅排行")
-        lines.append("")
-        lines.append("| 指数 | 收盘价 | 涨跌幅 | 成交额(亿) |")
-        lines.append("|:-----|-------:|-------:|----------:|")
-        
+        change_rows = []
         changes = market.get('changes', {}).get('daily', [])
         for item in changes:
             change = item.get('change_percent', 0)
@@ -85,13 +171,9 @@ class Reporter:
                 close_str = f"{close:.2f}"
             else:
                 close_str = "-"
-            lines.append(f"| {item['name']} | {close_str} | {change_str} | {amount_str} |")
-        
-        lines.append("")
+            change_rows.append(f"| {item['name']} | {close_str} | {change_str} | {amount_str} |\n")
         
         # 1.2 成交量分析
-        lines.append("### 1.2 成交量分析")
-        lines.append("")
         
         # 获取历史成交量数据
         volume_history = market.get('volume_history', {})
@@ -132,151 +214,88 @@ class Reporter:
                 trend = "数据不足"
                 interpretation = "需要更多历史数据进行趋势判断"
             
-            lines.append(f"**今日总成交额(沪市+深市)**: {total_amount/1e5:.1f}亿元")
-            lines.append("")
-            lines.append(f"| 指标 | 数值 |")
-            lines.append("|:-----|------:|")
-            lines.append(f"| 成交额 | {total_amount/1e5:.1f}亿 |")
-            lines.append(f"| 日均成交额(近{days_count}日) | {avg_amount:.1f}亿 |")
-            lines.append(f"| 最高成交额 | {max_vol[0]}: {max_vol[1]:.1f}亿 |")
-            lines.append(f"| 最低成交额 | {min_vol[0]}: {min_vol[1]:.1f}亿 |")
-            lines.append("")
-            lines.append(f"**趋势判断**: {trend}")
-            lines.append(f"**解读**: {interpretation}")
+            volume = _VOLUME_TMPL.format(
+                total=total_amount / 1e5,
+                days=days_count,
+                avg=avg_amount,
+                max_name=max_vol[0],
+                max_value=max_vol[1],
+                min_name=min_vol[0],
+                min_value=min_vol[1],
+                trend=trend,
+                interpretation=interpretation,
+            )
         else:
-            lines.append("- 暂无成交量数据")
-        
-        lines.append("")
-        
-        # 1.3 基差分析
-        if basis:
-            lines.extend(self.generate_basis_section(basis))
-        
-        return lines
+            volume = "- 暂无成交量数据\n"
+        
+        return _MARKET_TMPL.format(
+            change_rows=''.join(change_rows),
+            volume=volume,
+            # 1.3 基差分析
+            basis=self.generate_basis_section(basis),
+        )
     
-    def generate_basis_section(self, basis: List[Dict]) -> List[str]:
-        """生成基差分析部分"""
-        lines = []
-        
+    def generate_basis_section(self, basis: List[Dict]) -> str:
+        """生成基差分析部分，无基差数据时返回空字符串"""
         if not basis:
-            return lines
-        
-        lines.append("### 1.3 基差分析")
-        lines.append("")
-        lines.append("| 指数 | 合约 | 期货价 | 现货价 | 基差 | 年化基差率 |")
-        lines.append("|------|------|--------|--------|------|------------|")
+            return ""
         
+        rows = []
         for item in basis:
             arrow = "↓" if item['basis'] < 0 else "↑"
             ann = f"{arrow}{abs(item['annualized_basis']):.2f}%"
             index_name = item.get('index_name') or item.get('index', '')
-            lines.append(
+            rows.append(
                 f"| {index_name} | {item['contract']} | "
                 f"{item['futures_price']:.2f} | {item['spot_price']:.2f} | "
-                f"{arrow}{abs(item['basis']):.2f} | {ann} |"
+                f"{arrow}{abs(item['basis']):.2f} | {ann} |\n"
             )
         
-        # 添加交易日说明
-        if basis:
-            trading_days = basis[0].get('trading_days', 0)
-            lines.append("")
-            lines.append(f"> 交易日计算说明：距到期日 {trading_days} 个交易日")
-        
-        lines.append("")
-        
-        return lines
+        # 交易日说明
+        return _BASIS_TMPL.format(rows=''.join(rows), trading_days=basis[0].get('trading_days', 0))
     
-    def _generate_news_section(self, news: Dict) -> List[str]:
+    def _generate_news_section(self, news: Dict) -> str:
         """生成新闻分析部分"""
-        lines = []
-        
-        lines.append("---")
-        lines.append("")
-        lines.append("## 二、新闻分析")
-        lines.append("")
-        
-        # 2.1 新闻概况
-        lines.append("### 2.1 新闻概况")
-        lines.append("")
-        
-        lines.append(f"- 总数: {news.get('count', 0)} 条")
-        sentiment = news.get('sentiment', '中性')
-        lines.append(f"- 市场情绪: **{sentiment}**")
-        
-        lines.append("")
-        
-        # 2.2 今日新闻标题
-        lines.append("### 2.2 今日新闻标题")
-        lines.append("")
-        
         # 获取原始新闻数据
         all_news = news.get('all_news', [])
         if all_news:
             # 显示最新10条
+            items = []
             for i, item in enumerate(all_news[:10], 1):
                 title = item.get('title', '')[:50]  # 截断过长标题
                 source = item.get('source', '')
-                lines.append(f"{i}. **{title}**")
+                items.append(f"{i}. **{title}**\n")
                 if source:
-                    lines.append(f"   - 来源: {source}")
-                lines.append("")
+                    items.append(f"   - 来源: {source}\n")
+                items.append("\n")
+            items = ''.join(items)
         else:
             # 如果没有原始数据，显示高重要性新闻
             high_news = news.get('high_importance', [])
             if high_news:
-                for i, item in enumerate(high_news[:10], 1):
-                    lines.append(f"**{i}. {item.get('title', '')}**")
-                    lines.append(f"   - 分类: {item.get('category', '其他')}")
-                    lines.append("")
+                items = ''.join(
+                    f"**{i}. {item.get('title', '')}**\n   - 分类: {item.get('category', '其他')}\n\n"
+                    for i, item in enumerate(high_news[:10], 1)
+                )
             else:
-                lines.append("*暂无重要新闻*")
-        
-        lines.append("")
+                items = "*暂无重要新闻*\n"
         
-        return lines
+        return _NEWS_TMPL.format(
+            count=news.get('count', 0),
+            sentiment=news.get('sentiment', '中性'),
+            items=items,
+        )
     
-    def _generate_conclusion_section(self, conclusion: Dict) -> List[str]:
+    def _generate_conclusion_section(self, conclusion: Dict) -> str:
         """生成综合结论部分"""
-        lines = []
-        
-        lines.append("---")
-        lines.append("")
-        lines.append("## 三、综合结论")
-        lines.append("")
-        
-        # 3.1 市场判断
-        lines.append("### 3.1 市场判断")
-        lines.append("")
-        lines.append(conclusion.get('market_view', '震荡整理'))
-        lines.append("")
-        
-        # 3.2 风险提示
-        lines.append("### 3.2 风险提示")
-        lines.append("")
-        
         risk_alerts = conclusion.get('risk_alerts', [])
-        if risk_alerts:
-            for alert in risk_alerts:
-                lines.append(f"- {alert}")
-        else:
-            lines.append("- 无明显风险提示")
-        
-        lines.append("")
-        
-        # 3.3 投资建议
-        lines.append("### 3.3 投资建议")
-        lines.append("")
-        
         recommendations = conclusion.get('recommendations', [])
-        if recommendations:
-            for rec in recommendations:
-                lines.append(f"- {rec}")
-        else:
-            lines.append("- 建议保持观望")
         
-        lines.append("")
-        
-        return lines
+        return _CONCLUSION_TMPL.format(
+            market_view=conclusion.get('market_view', '震荡整理'),
+            risk_alerts=''.join(f"- {alert}\n" for alert in risk_alerts) or "- 无明显风险提示\n",
+            recommendations=''.join(f"- {rec}\n" for rec in recommendations) or "- 建议保持观望\n",
+        )
     
     def to_feishu(self, analysis: Dict) -> str:
         """
@@ -288,21 +307,8 @@ class Reporter:
         Returns:
             飞书消息文本
         """
-        date = analysis.get('date', datetime.now().strftime("%Y-%m-%d"))
-        
-        lines = []
-        
-        lines.append(f"📈 市场每日简报 {date}")
-        lines.append("")
-        lines.append("━━━━━━━━━━━━━━━━━━━━")
-        lines.append("")
-        
         # 行情
-        lines.append("## 一、行情分析")
-        lines.append("")
-        lines.append("### 涨跌幅排行")
-        lines.append("")
-        
+        change_rows = []
         changes = analysis.get('market', {}).get('changes', {}).get('daily', [])
         for item in changes[:5]:
             change = f"{item['change_percent']:+.2f}%"
@@ -312,63 +318,42 @@ class Reporter:
                 amount_str = f" 成交{amount/1e8:.0f}亿"
             else:
                 amount_str = ""
-            lines.append(f"{item['name']}: {item['price']:.2f} ({change}){amount_str}")
-        
-        lines.append("")
+            change_rows.append(f"{item['name']}: {item['price']:.2f} ({change}){amount_str}\n")
         
         # 基差
         basis = analysis.get('basis', [])
+        basis_block = ""
         if basis:
-            lines.append("### 基差分析")
-            lines.append("")
-            
+            basis_rows = []
             for item in basis[:5]:
                 arrow = "↓" if item['basis'] < 0 else "↑"
                 ann = f"{item['annualized_basis']:+.2f}%"
-                lines.append(
-                    f"{item['index']}{item['contract']}: {arrow}{abs(item['basis']):.2f} ({ann})"
+                basis_rows.append(
+                    f"{item['index']}{item['contract']}: {arrow}{abs(item['basis']):.2f} ({ann})\n"
                 )
-        
-        lines.append("")
-        lines.append("━━━━━━━━━━━━━━━━━━━━")
-        lines.append("")
+            basis_block = "### 基差分析\n\n" + ''.join(basis_rows)
         
         # 新闻
-        lines.append("## 二、新闻分析")
-        lines.append("")
-        
         news = analysis.get('news', {})
-        sentiment = news.get('sentiment', '中性')
-        lines.append(f"总数: {news.get('count', 0)}条 | 市场情绪: {sentiment}")
-        
-        lines.append("")
-        
-        high_news = news.get('high_importance', [])
-        if high_news:
-            for i, item in enumerate(high_news[:3], 1):
-                lines.append(f"{i}. {item['title'][:40]}")
-                lines.append(f"   [{item.get('category', '其他')}]")
-        
-        lines.append("")
-        lines.append("━━━━━━━━━━━━━━━━━━━━")
-        lines.append("")
+        news_rows = ''.join(
+            f"{i}. {item['title'][:40]}\n   [{item.get('category', '其他')}]\n"
+            for i, item in enumerate(news.get('high_importance', [])[:3], 1)
+        )
         
         # 结论
-        lines.append("## 三、综合结论")
-        lines.append("")
-        
         conclusion = analysis.get('conclusion', {})
-        lines.append(f"判断: {conclusion.get('market_view', '震荡整理')}")
-        
-        for rec in conclusion.get('recommendations', []):
-            lines.append(f"- {rec}")
-        
-        lines.append("")
-        lines.append("━━━━━━━━━━━━━━━━━━━━")
-        lines.append("")
-        lines.append("🤖 本报告由 AI 自动生成")
         
-        return "\n".join(lines)
+        return _FEISHU_TMPL.format(
+            date=analysis.get('date', datetime.now().strftime("%Y-%m-%d")),
+            rule=_FEISHU_RULE,
+            change_rows=''.join(change_rows),
+            basis=basis_block,
+            count=news.get('count', 0),
+            sentiment=news.get('sentiment', '中性'),
+            news_rows=news_rows,
+            market_view=conclusion.get('market_view', '震荡整理'),
+            recommendations=''.join(f"- {rec}\n" for rec in conclusion.get('recommendations', [])),
+        )
 
 
 def main():
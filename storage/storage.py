@@ -3,16 +3,35 @@
 数据存储模块
 """
 
-import json
 import os
+import sys
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
+# 添加项目根目录
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from utils.json_codec import dump_to_file, loads
+
+
+@lru_cache(maxsize=32)
+def _read_bytes_cached(path: str, mtime_ns: int, size: int) -> bytes:
+    """按 (路径, 修改时间, 大小) 缓存文件内容，文件被改写后自动重新读取"""
+    with open(path, 'rb') as f:
+        return f.read()
+
 
 class Storage:
     """JSON文件存储"""
     
+    # load_range 并发读取文件的线程数
+    LOAD_WORKERS = 8
+    
     def __init__(self, data_dir: str = None):
         if data_dir is None:
             # 默认数据目录
@@ -20,6 +39,10 @@ class Storage:
             data_dir = base_dir / "data"
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        # 文件路径按字符串拼接，避免每次构造 Path 对象
+        self._dir_str = str(self.data_dir)
+        # 前缀 -> (目录修改时间, 排序后的日期列表)
+        self._dates_cache: Dict[str, tuple] = {}
     
     def _get_date(self, date: str = None) -> str:
         """获取日期字符串"""
@@ -27,10 +50,10 @@ class Storage:
             return datetime.now().strftime("%Y-%m-%d")
         return date
     
-    def _get_filepath(self, prefix: str, date: str = None) -> Path:
+    def _get_filepath(self, prefix: str, date: str = None) -> str:
         """获取文件路径"""
         date_str = self._get_date(date)
-        return self.data_dir / f"{prefix}_{date_str}.json"
+        return os.path.join(self._dir_str, f"{prefix}_{date_str}.json")
     
     def save(self, prefix: str, data: Dict, date: str = None) -> str:
         """
@@ -44,25 +67,30 @@ class Storage:
         Returns:
             保存的文件路径
         """
-        filepath = self._get_filepath(prefix, date)
+        date_str = self._get_date(date)
+        filepath = self._get_filepath(prefix, date_str)
         
         # 添加元数据
         full_data = {
-            'date': self._get_date(date),
+            'date': date_str,
             'type': prefix,
             'timestamp': datetime.now().isoformat(),
             'data': data
         }
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(full_data, f, ensure_ascii=False, indent=2)
+        dir_mtime = self._dir_mtime()
+        # 原子替换，读取方不会看到写了一半的文件；数据可重新采集，不强制落盘
+        dump_to_file(full_data, filepath, fsync=False)
+        self._update_dates_cache(prefix, dir_mtime, date_str, present=True)
         
-        return str(filepath)
+        return filepath
     
     def load(self, prefix: str, date: str = None) -> Optional[Dict]:
         """
         加载数据
         
+        同一文件未变化时复用已读取的内容，每次重新解析，返回值可自由修改
+        
         Args:
             prefix: 文件名前缀
             date: 日期，默认今天
@@ -72,27 +100,63 @@ class Storage:
         """
         filepath = self._get_filepath(prefix, date)
         
-        if not filepath.exists():
+        try:
+            stat = os.stat(filepath)
+        except FileNotFoundError:
             return None
         
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return loads(_read_bytes_cached(filepath, stat.st_mtime_ns, stat.st_size))
     
     def exists(self, prefix: str, date: str = None) -> bool:
         """检查数据文件是否存在"""
-        return self._get_filepath(prefix, date).exists()
+        return os.path.exists(self._get_filepath(prefix, date))
     
-    def list_dates(self, prefix: str) -> List[str]:
-        """列出所有日期"""
+    def _dir_mtime(self) -> int:
+        """数据目录的修改时间（纳秒），目录内文件增删或替换时会变化"""
+        return os.stat(self._dir_str).st_mtime_ns
+    
+    def _sorted_dates(self, prefix: str) -> List[str]:
+        """排序后的日期列表（缓存对象，调用方不得修改）"""
+        dir_mtime = self._dir_mtime()
+        cached = self._dates_cache.get(prefix)
+        if cached is not None and cached[0] == dir_mtime:
+            return cached[1]
+        
         pattern = f"{prefix}_*.json"
-        files = self.data_dir.glob(pattern)
         dates = []
-        for f in files:
+        for f in self.data_dir.glob(pattern):
             # 提取日期
             name = f.stem
             date_str = name.replace(f"{prefix}_", "")
             dates.append(date_str)
-        return sorted(dates)
+        dates.sort()
+        
+        self._dates_cache[prefix] = (dir_mtime, dates)
+        return dates
+    
+    def _update_dates_cache(self, prefix: str, dir_mtime: int, date_str: str, present: bool) -> None:
+        """
+        本实例写入/删除文件后同步更新日期缓存
+        
+        dir_mtime 为操作前的目录修改时间；缓存在操作前已过期（如其他进程改动了目录）则直接丢弃
+        """
+        cached = self._dates_cache.get(prefix)
+        if cached is None or cached[0] != dir_mtime:
+            self._dates_cache.pop(prefix, None)
+            return
+        
+        dates = cached[1]
+        i = bisect_left(dates, date_str)
+        found = i < len(dates) and dates[i] == date_str
+        if present and not found:
+            dates.insert(i, date_str)
+        elif not present and found:
+            del dates[i]
+        self._dates_cache[prefix] = (self._dir_mtime(), dates)
+    
+    def list_dates(self, prefix: str) -> List[str]:
+        """列出所有日期（按目录修改时间缓存，目录变化后重新扫描）"""
+        return list(self._sorted_dates(prefix))
     
     def load_range(self, prefix: str, start_date: str, end_date: str) -> List[Dict]:
         """
@@ -106,19 +170,30 @@ class Storage:
         Returns:
             数据列表
         """
-        results = []
-        for date_str in self.list_dates(prefix):
-            if start_date <= date_str <= end_date:
-                data = self.load(prefix, date_str)
-                if data:
-                    results.append(data)
-        return results
+        # 日期为 ISO 格式，字典序即时间序，二分定位区间后只读取区间内的文件
+        dates = self._sorted_dates(prefix)
+        lo = bisect_left(dates, start_date)
+        hi = bisect_right(dates, end_date)
+        
+        selected = dates[lo:hi]
+        if len(selected) <= 1:
+            loaded = [self.load(prefix, date_str) for date_str in selected]
+        else:
+            # 各文件相互独立，并发读取；map 保持日期顺序
+            workers = min(self.LOAD_WORKERS, len(selected))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                loaded = list(executor.map(lambda date_str: self.load(prefix, date_str), selected))
+        
+        return [data for data in loaded if data]
     
     def delete(self, prefix: str, date: str = None) -> bool:
         """删除数据文件"""
-        filepath = self._get_filepath(prefix, date)
-        if filepath.exists():
-            filepath.unlink()
+        date_str = self._get_date(date)
+        filepath = self._get_filepath(prefix, date_str)
+        if os.path.exists(filepath):
+            dir_mtime = self._dir_mtime()
+            os.unlink(filepath)
+            self._update_dates_cache(prefix, dir_mtime, date_str, present=False)
             return True
         return False
     
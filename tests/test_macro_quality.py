@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+宏观数据质量检查：范围检查与历史 z-score 判断
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+# 添加项目根目录
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from macro_quality import MacroDataQualityChecker
+from utils.json_codec import dump_to_file
+
+
+def _cpi(value):
+    return {'data': {'cpi': {'yoy': value}}}
+
+
+class HistoryStatsTest(unittest.TestCase):
+    """历史快照中 CPI 同比的统计与判断"""
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.checker = MacroDataQualityChecker(self._tmp.name)
+    
+    def write_history(self, values):
+        for day, value in enumerate(values, start=1):
+            path = os.path.join(self._tmp.name, f'macro_2026-08-{day:02d}.json')
+            dump_to_file(_cpi(value), path)
+    
+    def test_below_min_history_uses_fixed_range_only(self):
+        # 29 个每日快照重复同一月度值，只算一个不同取值
+        self.write_history([0.5] * 29 + [0.8])
+        
+        self.assertNotIn('cpi', self.checker._history_stats())
+        result = self.checker.check_value_ranges(_cpi(4.5))
+        self.assertEqual(result['issues'], [])
+        self.assertEqual(result['warnings'], [])
+        self.assertEqual(result['score'], 100)
+    
+    def test_min_history_enables_zscore(self):
+        self.write_history([0.1, 0.3, 0.6, 1.0])
+        self.assertNotIn('cpi', self.checker._history_stats())
+        
+        self.write_history([0.1, 0.3, 0.6, 1.0, 1.2])
+        self.assertIn('cpi', self.checker._history_stats())
+    
+    def test_zscore_threshold(self):
+        self.write_history([0.1, 0.3, 0.6, 1.0, 1.2])
+        mu, sigma = self.checker._history_stats()['cpi']
+        k = self.checker.ZSCORE_K
+        
+        inside = self.checker.check_value_ranges(_cpi(round(mu + k * sigma - 0.01, 2)))
+        self.assertEqual(inside['warnings'], [])
+        
+        outside = self.checker.check_value_ranges(_cpi(round(mu + k * sigma + 0.01, 2)))
+        self.assertEqual(len(outside['warnings']), 1)
+        self.assertIn(f'偏离超过{k}倍标准差', outside['warnings'][0])
+        # 仍在固定范围内，只记警告，不影响得分
+        self.assertEqual(outside['issues'], [])
+        self.assertEqual(outside['score'], 100)
+    
+    def test_sigma_floor(self):
+        # 历史几乎不波动时，标准差取固定范围宽度的 MIN_SIGMA_RATIO 倍
+        self.write_history([2.0, 2.01, 2.02, 2.03, 2.04])
+        _, sigma = self.checker._history_stats()['cpi']
+        cfg = self.checker.VALUE_RANGES['cpi']
+        self.assertAlmostEqual(sigma, (cfg['max'] - cfg['min']) * self.checker.MIN_SIGMA_RATIO)
+        
+        # 未设下限时 2.5 会远超 3 倍标准差
+        result = self.checker.check_value_ranges(_cpi(2.5))
+        self.assertEqual(result['warnings'], [])
+    
+    def test_out_of_range_is_issue_even_with_history(self):
+        self.write_history([0.1, 0.3, 0.6, 1.0, 1.2])
+        self.assertIn('cpi', self.checker._history_stats())
+        
+        result = self.checker.check_value_ranges(_cpi(6.0))
+        self.assertEqual(len(result['issues']), 1)
+        self.assertIn('合理范围', result['issues'][0])
+        self.assertEqual(result['warnings'], [])
+        self.assertEqual(result['score'], 100 - self.checker.RANGE_WEIGHTS[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,26 +3,47 @@
 工具模块
 """
 
-from .trading_calendar import (
-    is_trading_day,
-    is_weekend,
-    is_holiday,
-    get_trading_days_between,
-    get_trading_days_to_expiry,
-    get_contract_expiry,
-    get_futures_expiry_date,
-)
-
-from .data_validator import (
-    validate_market_data,
-    validate_futures_data,
-    validate_news_data,
-    validate_basis_data,
-)
-
-from .data_retry import retry_with_backoff, retry_task, RetryConfig
-
-from .data_quality import generate_quality_report, check_market_data
+import importlib
+
+# 导出名 -> 所在子模块；首次访问时才导入对应子模块（PEP 562），
+# 只用到其中一部分工具的脚本不必加载全部子模块
+_LAZY = {
+    # trading calendar
+    'is_trading_day': 'trading_calendar',
+    'is_weekend': 'trading_calendar',
+    'is_holiday': 'trading_calendar',
+    'get_trading_days_between': 'trading_calendar',
+    'get_trading_days_to_expiry': 'trading_calendar',
+    'get_contract_expiry': 'trading_calendar',
+    'get_futures_expiry_date': 'trading_calendar',
+    # validator
+    'validate_market_data': 'data_validator',
+    'validate_futures_data': 'data_validator',
+    'validate_news_data': 'data_validator',
+    'validate_basis_data': 'data_validator',
+    # retry
+    'retry_with_backoff': 'data_retry',
+    'retry_task': 'data_retry',
+    'RetryConfig': 'data_retry',
+    # quality
+    'generate_quality_report': 'data_quality',
+    'check_market_data': 'data_quality',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    # 缓存到模块命名空间，之后的访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     # trading calendar
@@ -9,6 +9,9 @@ from typing import Dict, List, Tuple
 # 一年交易日（A股）
 TRADING_DAYS_PER_YEAR = 244
 
+# 距到期交易日缓存: (trade_date, expiry_month) -> 交易日数
+_trading_days_cache: Dict[Tuple[str, str], int] = {}
+
 
 def get_trading_days_to_expiry(trade_date: str, expiry_month: str, pro) -> int:
     """
@@ -26,7 +29,13 @@ def get_trading_days_to_expiry(trade_date: str, expiry_month: str, pro) -> int:
     
     返回:
         距到期的交易日数量
+    
+    同一 (trade_date, expiry_month) 的结果在进程内缓存，避免重复请求交易日历。
     """
+    key = (trade_date, expiry_month)
+    if key in _trading_days_cache:
+        return _trading_days_cache[key]
+    
     # 1. 计算到期日（第三周周五）
     year = int(expiry_month[:4])
     month = int(expiry_month[4:])
@@ -53,7 +62,9 @@ def get_trading_days_to_expiry(trade_date: str, expiry_month: str, pro) -> int:
         (df_cal['is_open'] == 1)               # 只算交易日
     ]
     
-    return len(trading_days)
+    days = len(trading_days)
+    _trading_days_cache[key] = days
+    return days
 
 
 def calculate_basis_annual_return(spot: float, future: float, 
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+akshare 表格单元格取值工具
+"""
+
+# akshare 中表示缺失值的单元格内容
+SENTINELS = frozenset(('', '--', '-', None))
+
+
+def safe_float(value, default: float = 0.0) -> float:
+    """将 akshare 单元格转为浮点数，缺失值记为 default"""
+    return default if value in SENTINELS else float(value)
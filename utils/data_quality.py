@@ -5,6 +5,7 @@
 
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
+from itertools import chain
 import json
 
 from utils.data_validator import (
@@ -18,6 +19,9 @@ from utils.data_validator import (
 @dataclass
 class QualityResult:
     """质量检查结果"""
+    # 兼容 Python 3.8，手动声明 __slots__ 而非 dataclass(slots=True)
+    __slots__ = ('score', 'passed', 'issues', 'warnings', 'report')
+    
     score: int
     passed: bool
     issues: List[str]
@@ -143,6 +147,20 @@ def check_basis_data(data: Optional[Dict]) -> Dict:
     }
 
 
+def _render_section(parts: List[str], label: str, check: Dict, extra: str = "") -> None:
+    """将单项检查结果（标题、问题、警告）追加到报告片段列表"""
+    parts.append(f"【{label}】 {check['score']}分{extra}\n")
+    if check['issues']:
+        parts.append("  ❌ 问题:\n")
+        parts.extend(f"    - {i}\n" for i in check['issues'])
+    if check['warnings']:
+        parts.append("  ⚠️ 警告:\n")
+        parts.extend(f"    - {w}\n" for w in check['warnings'])
+    if not check['issues'] and not check['warnings']:
+        parts.append("  ✅ 正常\n")
+    parts.append("\n")
+
+
 def generate_quality_report(
     market_data: Optional[Dict] = None,
     futures_data: Optional[Dict] = None,
@@ -173,76 +191,38 @@ def generate_quality_report(
     
     total_score = sum(scores) // len(scores) if scores else 0
     
-    # 生成报告
-    report = "📋 数据质量报告\n" + "━" * 20 + "\n\n"
+    # 生成报告：各片段先收集到列表，最后一次拼接
+    parts = ["📋 数据质量报告\n", "━" * 20, "\n\n"]
     
-    # 行情数据
-    report += f"【行情数据】 {market_check['score']}分\n"
-    if market_check['issues']:
-        report += "  ❌ 问题:\n"
-        for i in market_check['issues']:
-            report += f"    - {i}\n"
-    if market_check['warnings']:
-        report += "  ⚠️ 警告:\n"
-        for w in market_check['warnings']:
-            report += f"    - {w}\n"
-    if not market_check['issues'] and not market_check['warnings']:
-        report += "  ✅ 正常\n"
-    report += "\n"
+    _render_section(parts, "行情数据", market_check)
     
-    # 期货数据
-    report += f"【期货数据】 {futures_check['score']}分"
+    futures_extra = ""
     if futures_check.get('filled') is not None:
-        report += f" ({futures_check['filled']}/{futures_check['total']}合约)"
-    report += "\n"
-    if futures_check['issues']:
-        report += "  ❌ 问题:\n"
-        for i in futures_check['issues']:
-            report += f"    - {i}\n"
-    if futures_check['warnings']:
-        report += "  ⚠️ 警告:\n"
-        for w in futures_check['warnings']:
-            report += f"    - {w}\n"
-    if not futures_check['issues'] and not futures_check['warnings']:
-        report += "  ✅ 正常\n"
-    report += "\n"
+        futures_extra = f" ({futures_check['filled']}/{futures_check['total']}合约)"
+    _render_section(parts, "期货数据", futures_check, futures_extra)
     
-    # 新闻数据
-    report += f"【新闻数据】 {news_check['score']}分"
-    if news_check.get('count'):
-        report += f" ({news_check['count']}条)"
-    report += "\n"
-    if news_check['issues']:
-        report += "  ❌ 问题:\n"
-        for i in news_check['issues']:
-            report += f"    - {i}\n"
-    if news_check['warnings']:
-        report += "  ⚠️ 警告:\n"
-        for w in news_check['warnings']:
-            report += f"    - {w}\n"
-    if not news_check['issues'] and not news_check['warnings']:
-        report += "  ✅ 正常\n"
-    report += "\n"
+    news_extra = f" ({news_check['count']}条)" if news_check.get('count') else ""
+    _render_section(parts, "新闻数据", news_check, news_extra)
     
     # 总评
-    report += "━" * 20 + "\n"
-    report += f"总分: {total_score}/100\n"
+    parts.append("━" * 20 + "\n")
+    parts.append(f"总分: {total_score}/100\n")
     
     if total_score >= 90:
-        report += "✅ 优秀\n"
+        parts.append("✅ 优秀\n")
     elif total_score >= 70:
-        report += "✅ 合格\n"
+        parts.append("✅ 合格\n")
     elif total_score >= 50:
-        report += "⚠️ 一般\n"
+        parts.append("⚠️ 一般\n")
     else:
-        report += "❌ 较差，需要重新采集\n"
+        parts.append("❌ 较差，需要重新采集\n")
     
     return QualityResult(
         score=total_score,
         passed=total_score >= 70,
-        issues=market_check['issues'] + futures_check['issues'] + news_check['issues'],
-        warnings=market_check['warnings'] + futures_check['warnings'] + news_check['warnings'],
-        report=report
+        issues=list(chain(market_check['issues'], futures_check['issues'], news_check['issues'])),
+        warnings=list(chain(market_check['warnings'], futures_check['warnings'], news_check['warnings'])),
+        report=''.join(parts)
     )
 
 
@@ -35,7 +35,30 @@ def retry_with_backoff(
         backoff_factor: 退避因子
         exceptions: 需要捕获的异常类型
     """
+    # 各次重试前的等待时间只取决于参数，装饰时一次算好
+    delays = tuple(base_delay * (backoff_factor ** i) for i in range(max(max_retries - 1, 0)))
+    
     def decorator(func: Callable) -> Callable:
+        # 根据函数类型只构建对应的包装器
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                last_error = None
+                for attempt in range(1, max_retries + 1):
+                    try:
+                        return await func(*args, **kwargs)
+                    except exceptions as e:
+                        last_error = e
+                        if attempt < max_retries:
+                            delay = delays[attempt - 1]
+                            logger.warning(f"第{attempt}次尝试失败: {e}, {delay:.1f}秒后重试...")
+                            await asyncio.sleep(delay)
+                        else:
+                            logger.error(f"达到最大重试次数({max_retries}): {e}")
+                raise RetryError(f"重试{max_retries}次后仍失败: {last_error}")
+            
+            return async_wrapper
+        
         @wraps(func)
         def sync_wrapper(*args, **kwargs) -> Any:
             last_error = None
@@ -45,32 +68,13 @@ def retry_with_backoff(
                 except exceptions as e:
                     last_error = e
                     if attempt < max_retries:
-                        delay = base_delay * (backoff_factor ** (attempt - 1))
+                        delay = delays[attempt - 1]
                         logger.warning(f"第{attempt}次尝试失败: {e}, {delay:.1f}秒后重试...")
                         time.sleep(delay)
                     else:
                         logger.error(f"达到最大重试次数({max_retries}): {e}")
             raise RetryError(f"重试{max_retries}次后仍失败: {last_error}")
         
-        @wraps(func)
-        async def async_wrapper(*args, **kwargs) -> Any:
-            last_error = None
-            for attempt in range(1, max_retries + 1):
-                try:
-                    return await func(*args, **kwargs)
-                except exceptions as e:
-                    last_error = e
-                    if attempt < max_retries:
-                        delay = base_delay * (backoff_factor ** (attempt - 1))
-                        logger.warning(f"第{attempt}次尝试失败: {e}, {delay:.1f}秒后重试...")
-                        await asyncio.sleep(delay)
-                    else:
-                        logger.error(f"达到最大重试次数({max_retries}): {e}")
-            raise RetryError(f"重试{max_retries}次后仍失败: {last_error}")
-        
-        # 根据函数类型返回对应包装器
-        if asyncio.iscoroutinefunction(func):
-            return async_wrapper
         return sync_wrapper
     
     return decorator
@@ -5,11 +5,18 @@
 
 from typing import Dict, List, Any, Tuple
 from dataclasses import dataclass
+from itertools import product
+
+# 基差合理性阈值：基差绝对值、年化基差率(%)
+BASIS_LIMIT = 1000
+ANNUALIZED_BASIS_LIMIT = 50
 
 
 @dataclass
 class ValidationResult:
     """验证结果"""
+    __slots__ = ('valid', 'errors', 'warnings')
+    
     valid: bool
     errors: List[str]
     warnings: List[str]
@@ -19,7 +26,7 @@ class MarketDataValidator:
     """行情数据验证器"""
     
     REQUIRED_FIELDS = ['code', 'name', 'price', 'change_percent']
-    REQUIRED_INDICES = [
+    REQUIRED_INDICES = frozenset([
         'sh000001',  # 上证指数
         'sz399001', # 深证成指
         'sh000300', # 沪深300
@@ -28,7 +35,7 @@ class MarketDataValidator:
         'sh000016', # 上证50
         'sh000688', # 科创50
         'sz399006', # 创业板指
-    ]
+    ])
     
     def validate(self, data: List[Dict]) -> ValidationResult:
         errors = []
@@ -37,47 +44,51 @@ class MarketDataValidator:
         if not data:
             return ValidationResult(False, ["数据为空"], [])
         
-        # 检查必需的指数
-        codes = {item.get('code') for item in data if item.get('code')}
-        missing = set(self.REQUIRED_INDICES) - codes
-        if missing:
-            errors.append(f"缺少指数: {missing}")
-        
-        # 验证每条数据
+        # 验证每条数据，同一遍中从必需指数里划掉已出现的代码
+        missing = set(self.REQUIRED_INDICES)
         for item in data:
-            result = self._validate_item(item)
-            errors.extend(result.errors)
-            warnings.extend(result.warnings)
+            missing.discard(item.get('code'))
+            self._validate_item(item, errors, warnings)
+        
+        # 检查必需的指数（排在逐条错误之前）
+        if missing:
+            errors.insert(0, f"缺少指数: {missing}")
         
         return ValidationResult(len(errors) == 0, errors, warnings)
     
-    def _validate_item(self, item: Dict) -> ValidationResult:
-        errors = []
-        warnings = []
-        
-        # 必填字段
-        for field in self.REQUIRED_FIELDS:
-            if not item.get(field):
-                errors.append(f"缺少字段: {field}")
+    def _validate_item(self, item: Dict, errors: List[str], warnings: List[str]) -> None:
+        """验证单条数据，问题直接追加到调用方的 errors/warnings"""
+        code = item.get('code')
+        name = item.get('name')
+        price = item.get('price')
+        change = item.get('change_percent')
+        
+        # 必填字段：通常全部齐全，只有存在缺失时才逐项报告
+        if not (code and name and price and change):
+            for field, value in zip(self.REQUIRED_FIELDS, (code, name, price, change)):
+                if not value:
+                    errors.append(f"缺少字段: {field}")
         
         # 价格验证
-        price = item.get('price', 0)
         if price and price <= 0:
             errors.append(f"价格异常: {price}")
         
         # 涨跌幅验证
-        change = item.get('change_percent', 0)
         if change and (change < -20 or change > 20):
             warnings.append(f"涨跌幅异常: {change}%")
-        
-        return ValidationResult(len(errors) == 0, errors, warnings)
 
 
 class FuturesDataValidator:
     """期货数据验证器"""
     
-    REQUIRED_CONTRACTS = ['IF', 'IC', 'IM', 'IH']
-    CONTRACT_TYPES = ['当月', '下季', '隔季']
+    REQUIRED_CONTRACTS = ('IF', 'IC', 'IM', 'IH')
+    CONTRACT_TYPES = ('当月', '下季', '隔季')
+    
+    # 需要检查的 (品种, 合约类型) 组合，按品种分组；IH可能没有隔季
+    _REQUIRED_PAIRS = tuple(
+        pair for pair in product(REQUIRED_CONTRACTS, CONTRACT_TYPES)
+        if pair != ('IH', '隔季')
+    )
     
     def validate(self, data: Dict) -> ValidationResult:
         errors = []
@@ -86,24 +97,23 @@ class FuturesDataValidator:
         if not data:
             return ValidationResult(False, ["期货数据为空"], [])
         
-        # 检查必需的指数
-        for code in self.REQUIRED_CONTRACTS:
+        # 按品种顺序检查每个合约，整个品种缺失时只报一次
+        missing_code = None
+        for code, ct in self._REQUIRED_PAIRS:
             if code not in data:
-                errors.append(f"缺少期货数据: {code}")
+                if code != missing_code:
+                    errors.append(f"缺少期货数据: {code}")
+                    missing_code = code
                 continue
             
-            # 检查每个合约
-            for ct in self.CONTRACT_TYPES:
-                if code == 'IH' and ct == '隔季':
-                    continue  # IH可能没有隔季
-                
-                if ct not in data[code]:
-                    warnings.append(f"缺少 {code} {ct} 合约数据")
-                    continue
-                
-                contract = data[code][ct]
-                if not contract or not contract.get('price'):
-                    errors.append(f"缺少 {code} {ct} 价格")
+            contracts = data[code]
+            if ct not in contracts:
+                warnings.append(f"缺少 {code} {ct} 合约数据")
+                continue
+            
+            contract = contracts[ct]
+            if not contract or not contract.get('price'):
+                errors.append(f"缺少 {code} {ct} 价格")
         
         return ValidationResult(len(errors) == 0, errors, warnings)
 
@@ -111,7 +121,7 @@ class FuturesDataValidator:
 class NewsDataValidator:
     """新闻数据验证器"""
     
-    CATEGORIES = ['宏观政策', '行业动态', '国际市场', '公司重大事项', '其他']
+    CATEGORIES = frozenset(['宏观政策', '行业动态', '国际市场', '公司重大事项', '其他'])
     
     def validate(self, data: List[Dict]) -> ValidationResult:
         errors = []
@@ -127,10 +137,11 @@ class NewsDataValidator:
             if not item.get('title'):
                 errors.append("缺少标题")
             
-            if not item.get('category'):
+            category = item.get('category')
+            if not category:
                 errors.append("缺少分类")
-            elif item['category'] not in self.CATEGORIES:
-                warnings.append(f"未知分类: {item['category']}")
+            elif category not in self.CATEGORIES:
+                warnings.append(f"未知分类: {category}")
         
         return ValidationResult(len(errors) == 0, errors, warnings)
 
@@ -153,15 +164,20 @@ class BasisDataValidator:
                 errors.append("缺少现货价格")
             
             # 基差合理性检查
-            basis = item.get('basis', 0)
-            if basis and abs(basis) > 1000:
-                warnings.append(f"基差绝对值较大: {basis}")
-            
-            ann_basis = item.get('annualized_basis', 0)
-            if ann_basis and abs(ann_basis) > 50:
-                warnings.append(f"年化基差异常: {ann_basis}%")
+            self._check_ranges(item, warnings)
         
         return ValidationResult(len(errors) == 0, errors, warnings)
+    
+    @staticmethod
+    def _check_ranges(item: Dict, warnings: List[str]) -> None:
+        """逐条检查基差、年化基差率是否超出阈值"""
+        basis = item.get('basis', 0)
+        if basis and abs(basis) > BASIS_LIMIT:
+            warnings.append(f"基差绝对值较大: {basis}")
+        
+        ann_basis = item.get('annualized_basis', 0)
+        if ann_basis and abs(ann_basis) > ANNUALIZED_BASIS_LIMIT:
+            warnings.append(f"年化基差异常: {ann_basis}%")
 
 
 def validate_market_data(data: List[Dict]) -> ValidationResult:
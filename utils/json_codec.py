@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+JSON 编解码模块
+优先使用 orjson，未安装时回退到标准库 json
+"""
+
+import json
+import os
+from typing import Any, Callable, Optional, Union
+
+# 尝试导入 orjson
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def dumps(obj: Any, indent: bool = True, default: Optional[Callable] = None) -> str:
+    """
+    序列化为 JSON 字符串（不转义非ASCII字符，等价于 ensure_ascii=False）
+
+    Args:
+        obj: 要序列化的对象
+        indent: 是否使用2空格缩进
+        default: 无法序列化的对象的转换函数
+
+    Returns:
+        JSON 字符串
+    """
+    if HAS_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=default, option=option).decode('utf-8')
+        except TypeError:
+            # orjson 不支持的类型（如超过64位的整数），交给标准库处理
+            pass
+
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=default)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=default)
+
+
+def _write_atomic(filepath: str, payload: bytes, fsync: bool = True) -> None:
+    """
+    先写临时文件，再替换目标文件，读取方只会看到旧文件或完整的新文件
+    fsync 为 False 时不强制落盘（断电可能丢失最近一次写入，适用于可重新生成的数据）
+    """
+    tmp_path = f"{filepath}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def dump_to_file(obj: Any, filepath: str, indent: bool = True,
+                 default: Optional[Callable] = None, fsync: bool = True) -> str:
+    """
+    序列化并原子写入文件
+
+    Args:
+        obj: 要序列化的对象
+        filepath: 目标文件路径
+        indent: 是否使用2空格缩进
+        default: 无法序列化的对象的转换函数
+        fsync: 替换前是否强制落盘
+
+    Returns:
+        目标文件路径
+    """
+    _write_atomic(filepath, dumps(obj, indent=indent, default=default).encode('utf-8'), fsync=fsync)
+    return filepath
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    反序列化 JSON 字符串或字节串
+
+    Args:
+        data: JSON 文本
+
+    Returns:
+        解析结果
+    """
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # 历史文件可能含有标准库写出的 NaN/Infinity，orjson 不接受
+            pass
+
+    return json.loads(data)
@@ -4,12 +4,22 @@
 计算交易日、到期日
 """
 
-from datetime import datetime, timedelta
-from typing import List, Optional
+import calendar
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, Optional, Union
 import json
 import os
 
-# 2026年节假日
+# 尝试导入 numpy（交易日计数、推移使用其 C 实现的工作日函数）
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# 2026年节假日（原始数据，查询使用下方的 _HOLIDAY_ORDINALS）
 HOLIDAYS_2026 = [
     "2026-01-01",  # 元旦
     "2026-01-28",  # 春节
@@ -58,56 +68,116 @@ FUTURES_EXPIRY_2026 = [
     "2026-12-18",  # 12月
 ]
 
+# 节假日的公历序数（date.toordinal()），判断节假日时直接查集合，无需格式化日期
+_HOLIDAY_ORDINALS = frozenset(
+    datetime.strptime(d, "%Y-%m-%d").toordinal() for d in HOLIDAYS_2026
+)
+# 升序排列的节假日序数，供逐日向后扫描时用游标比对
+_HOLIDAY_ORDINALS_SORTED = tuple(sorted(_HOLIDAY_ORDINALS))
+
+# 已公布的期货到期日，按 (年, 月) 索引
+_EXPIRY_BY_YM = {
+    (d.year, d.month): d
+    for d in (datetime.strptime(s, "%Y-%m-%d") for s in FUTURES_EXPIRY_2026)
+}
+
+if HAS_NUMPY:
+    _HOLIDAY_DATES64 = np.array(HOLIDAYS_2026, dtype='datetime64[D]')
+
 
 def is_weekend(date: datetime) -> bool:
     """判断是否周末"""
     return date.weekday() >= 5  # 5=周六, 6=周日
 
 
+def _as_date(value: Union[datetime, date]) -> date:
+    """取自然日：datetime 去掉时分秒，date 原样返回（缓存均以自然日为键）"""
+    return value.date() if isinstance(value, datetime) else value
+
+
+@lru_cache(maxsize=4096)
+def _is_trading_date(day: date) -> bool:
+    return day.weekday() < 5 and day.toordinal() not in _HOLIDAY_ORDINALS
+
+
+@lru_cache(maxsize=4096)
+def _count_trading_days(first_day: date, last_day: date) -> int:
+    if first_day > last_day:
+        return 0
+    
+    if HAS_NUMPY:
+        # busday_count 统计 [begin, end) 区间，结束日需加一天
+        return int(np.busday_count(
+            np.datetime64(first_day, 'D'),
+            np.datetime64(last_day + timedelta(days=1), 'D'),
+            holidays=_HOLIDAY_DATES64,
+        ))
+    
+    count = 0
+    current = first_day
+    while current <= last_day:
+        if _is_trading_date(current):
+            count += 1
+        current += timedelta(days=1)
+    return count
+
+
 def is_holiday(date: datetime) -> bool:
     """判断是否节假日"""
-    date_str = date.strftime("%Y-%m-%d")
-    return date_str in HOLIDAYS_2026
+    return date.toordinal() in _HOLIDAY_ORDINALS
 
 
 def is_trading_day(date: datetime) -> bool:
     """判断是否交易日"""
-    if is_weekend(date):
-        return False
-    if is_holiday(date):
-        return False
-    return True
+    return _is_trading_date(_as_date(date))
 
 
 def get_trading_days_between(start_date: datetime, end_date: datetime) -> int:
     """计算两个日期之间的交易日天数"""
-    count = 0
-    current = start_date
-    while current <= end_date:
-        if is_trading_day(current):
-            count += 1
-        current += timedelta(days=1)
-    return count
+    # 按起始时刻逐日步进：起始时刻晚于结束时刻时，结束当天不计入
+    last_day = _as_date(end_date)
+    if (isinstance(start_date, datetime) and isinstance(end_date, datetime)
+            and start_date.time() > end_date.time()):
+        last_day -= timedelta(days=1)
+    return _count_trading_days(_as_date(start_date), last_day)
 
 
 def get_next_trading_day(date: datetime) -> datetime:
     """获取下一个交易日"""
+    if HAS_NUMPY:
+        # 从次日起向后滚动到第一个交易日，按相差天数推移，保留原时刻
+        start = np.datetime64(_as_date(date) + timedelta(days=1), 'D')
+        target = np.busday_offset(start, 0, roll='forward', holidays=_HOLIDAY_DATES64)
+        return date + timedelta(days=1 + int((target - start).astype(int)))
+    
+    # 逐日向后扫描，节假日游标随日期单调前移
     current = date + timedelta(days=1)
-    while not is_trading_day(current):
+    ordinal = current.toordinal()
+    holidays = _HOLIDAY_ORDINALS_SORTED
+    i = bisect_left(holidays, ordinal)
+    while True:
+        while i < len(holidays) and holidays[i] < ordinal:
+            i += 1
+        if current.weekday() < 5 and not (i < len(holidays) and holidays[i] == ordinal):
+            return current
         current += timedelta(days=1)
-    return current
+        ordinal += 1
 
 
 def get_futures_expiry_date(year: int, month: int) -> datetime:
-    """获取期货到期日（当月第三个周五）"""
-    # 找到当月第一天
-    first_day = datetime(year, month, 1)
-    # 找到第一个周五
-    days_until_friday = (4 - first_day.weekday()) % 7
-    first_friday = first_day + timedelta(days=days_until_friday)
-    # 第三个周五
-    third_friday = first_friday + timedelta(weeks=2)
-    return third_friday
+    """获取期货到期日（优先查已公布的到期日表，表外月份按当月第三个周五计算）"""
+    expiry = _EXPIRY_BY_YM.get((year, month))
+    if expiry is None:
+        expiry = _third_friday(year, month)
+    return expiry
+
+
+@lru_cache(maxsize=256)
+def _third_friday(year: int, month: int) -> datetime:
+    """当月第三个周五"""
+    # 第一个周五是几号（周一为0，周五为4），再加两周
+    first_friday = 1 + (4 - calendar.weekday(year, month, 1)) % 7
+    return datetime(year, month, first_friday + 14)
 
 
 def get_contract_expiry(contract_type: str, year: int = None, month: int = None) -> datetime:
@@ -120,6 +190,11 @@ def get_contract_expiry(contract_type: str, year: int = None, month: int = None)
     if month is None:
         month = datetime.now().month
     
+    return _contract_expiry(contract_type, year, month)
+
+
+@lru_cache(maxsize=256)
+def _contract_expiry(contract_type: str, year: int, month: int) -> datetime:
     if contract_type == "当月":
         return get_futures_expiry_date(year, month)
     elif contract_type == "下季":